@@ -12,8 +12,12 @@ Focus: Recent bushfire risk zones for infrastructure planning.
 """
 
 import json
+import math
 import os
+import re
 import sys
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional
 import argparse
 from datetime import datetime, timedelta
@@ -21,7 +25,10 @@ from datetime import datetime, timedelta
 try:
     import geopandas as gpd
     import pandas as pd
-    import fiona
+    import numpy as np
+    import shapely
+    import pyogrio
+    import pyogrio.raw
     HAS_GEOPANDAS = True
 except ImportError:
     HAS_GEOPANDAS = False
@@ -29,29 +36,103 @@ except ImportError:
     print("Please install with: pip install geopandas")
     sys.exit(1)
 
+# Optional: faster JSON encoding
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Read through pyogrio (vectorized GDAL reads) rather than fiona's per-row loop
+gpd.options.io_engine = "pyogrio"
+
+# Candidate attribute columns, checked in order
+NAME_FIELDS = [
+    'FIRE_NAME', 'NAME', 'INCIDENT_NAME', 'EVENT_NAME',
+    'LOCATION', 'AREA_NAME', 'LOCALITY', 'PLACE'
+]
+STATUS_FIELDS = [
+    'STATUS', 'FIRE_STATUS', 'STATE', 'CONDITION',
+    'STAGE', 'PHASE', 'CURRENT_STATUS'
+]
+AREA_FIELDS = [
+    'AREA_HA', 'AREA_HECTARES', 'SIZE_HA', 'Hectares',
+    'SHAPE_Area', 'AREA', 'SIZE', 'Shape_Area'
+]
+READ_COLUMNS = list(dict.fromkeys(['Title', 'Hectares'] + NAME_FIELDS + STATUS_FIELDS + AREA_FIELDS))
+
+# Title keywords per risk level, one alternation each so a title is scanned once per tier
+EXTREME_RE = re.compile(r"extreme|emergency|evacuation|catastrophic|critical")
+HIGH_RE = re.compile(r"high|severe|major|large|complex|significant")
+MODERATE_RE = re.compile(r"moderate|medium|controlled|watch")
+LOW_RE = re.compile(r"low|small|contained|patrolled|monitor")
+
+# (risk level, title pattern), checked from most to least severe
+_RISK_TIERS = (
+    ("Extreme", EXTREME_RE),
+    ("High", HIGH_RE),
+    ("Moderate", MODERATE_RE),
+    ("Low", LOW_RE),
+)
+
+# (minimum hectares, risk level) used when no title keyword matches - more
+# conservative for data centres. Any other positive area is "Minimal"
+_AREA_TIERS = (
+    (5000, "Extreme"),   # Very large fires (50+ sq km)
+    (500, "High"),       # Large fires (5+ sq km)
+    (50, "Moderate"),    # Medium fires (0.5+ sq km)
+    (5, "Low"),          # Small significant fires
+)
+
+# Text values treated as missing (compared lowercased)
+_NULL_STRINGS = frozenset({'null', 'nan', 'none', ''})
+
+# Title keywords used to infer a status when no status field is set
+STATUS_CONTROLLED_RE = re.compile(r"controlled|contained|extinguished")
+STATUS_PATROL_RE = re.compile(r"patrol|monitor")
+STATUS_EMERGENCY_RE = re.compile(r"emergency|evacuation|immediate|critical")
+STATUS_ACTIVE_RE = re.compile(r"active|burning|going")
+
+# Integer risk codes used for scoring (priority score is 20 + 20 * code)
+RISK_CODES = {'Minimal': 0, 'Low': 1, 'Moderate': 2, 'High': 3, 'Extreme': 4}
+
+# Columns of the risk table built during extraction (one row per kept feature,
+# geometry as shapely objects); GeoJSON is only produced when it is written.
+# risk_code is internal to prioritization and is not written out
+RISK_TABLE_COLUMNS = ['risk_level', 'risk_code', 'fire_name', 'status', 'area_hectares',
+                      'original_geometry_type', 'geometry']
+
+def json_dumps(obj: Any) -> bytes:
+    """Serialize to compact JSON bytes, using orjson when available."""
+    if HAS_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
 def inspect_bushfire_gdb(gdb_path: str):
     """Inspect the layers and structure of the bushfire GDB file."""
     try:
-        layers = fiona.listlayers(gdb_path)
+        layers = [str(name) for name in pyogrio.list_layers(gdb_path)[:, 0]]
         print(f"\n📂 Inspecting {os.path.basename(gdb_path)}:")
         print(f"   Found {len(layers)} layer(s): {layers}")
         
         for layer in layers:
             try:
-                with fiona.open(gdb_path, layer=layer) as src:
-                    print(f"\n🔍 Layer '{layer}':")
-                    print(f"   Total features: {len(src):,}")
-                    
-                    # Sample first few features to see properties
-                    first_feature = next(iter(src), None)
-                    if first_feature:
-                        props = list(first_feature['properties'].keys())
-                        print(f"   Properties ({len(props)}): {props}")
-                        
-                        # Show sample values for key properties
-                        print(f"   Sample values:")
-                        for prop, value in list(first_feature['properties'].items())[:8]:
-                            print(f"     {prop}: {value} ({type(value).__name__})")
+                # Feature count and schema come back from one GDAL call
+                info = pyogrio.read_info(gdb_path, layer=layer)
+                print(f"\n🔍 Layer '{layer}':")
+                print(f"   Total features: {info['features']:,}")
+                
+                # Sample first feature to see properties
+                props = list(info['fields'])
+                print(f"   Properties ({len(props)}): {props}")
+                
+                sample = pyogrio.read_dataframe(gdb_path, layer=layer, max_features=1,
+                                                read_geometry=False)
+                if len(sample):
+                    # Show sample values for key properties
+                    print(f"   Sample values:")
+                    for prop, value in list(sample.iloc[0].items())[:8]:
+                        print(f"     {prop}: {value} ({type(value).__name__})")
                     
             except Exception as e:
                 print(f"     Error reading layer {layer}: {e}")
@@ -61,65 +142,103 @@ def inspect_bushfire_gdb(gdb_path: str):
         print(f"Error inspecting {gdb_path}: {e}")
         return []
 
+def _process_batch(batch, geometry_column: str, crs: Any, min_area_hectares: float,
+                   needs_reproject: bool) -> pd.DataFrame:
+    """Decode one Arrow batch and return its risk table (runs in a worker thread)."""
+    # Attributes go straight to pandas; geometries decode from WKB in one call
+    attributes = batch.drop_columns([geometry_column]).to_pandas()
+    geometries = shapely.from_wkb(batch.column(geometry_column).to_numpy(zero_copy_only=False))
+    gdf_chunk = gpd.GeoDataFrame(attributes, geometry=geometries, crs=crs)
+    
+    # Extract bushfire risk features with filtering (centroids in the layer's CRS)
+    risk_table = extract_risk_features_filtered(gdf_chunk, min_area_hectares)
+    
+    # Ensure WGS84 for consistency - only the kept output points are reprojected,
+    # not every source polygon
+    if needs_reproject:
+        risk_table['geometry'] = gpd.GeoSeries(risk_table['geometry'].to_numpy(), crs=crs) \
+            .to_crs('EPSG:4326').to_numpy()
+    
+    return risk_table
+
 def extract_bushfire_risk_areas(gdb_path: str, layer_name: str, chunk_size: int = 3000, 
                                 min_area_hectares: float = 0.01, 
-                                max_total_features: int = 200) -> List[Dict[str, Any]]:
+                                max_total_features: int = 200,
+                                workers: Optional[int] = None) -> pd.DataFrame:
     """
-    Extract bushfire risk areas using chunked processing with smart filtering.
+    Extract bushfire risk areas from one Arrow stream of the layer with smart filtering.
     
     Args:
         gdb_path: Path to GDB file
         layer_name: Layer to process
-        chunk_size: Number of features per chunk
+        chunk_size: Number of features per Arrow batch (one unit of work per worker task)
         min_area_hectares: Minimum fire area to include (hectares)
         max_total_features: Maximum features to keep (keeps highest priority)
+        workers: Worker threads for batch processing (defaults to CPU count)
+    
+    Batches are read on the calling thread (a GDAL dataset must not be shared
+    between threads) and processed by a thread pool; WKB decoding, centroids
+    and reprojection spend most of their time in C code that releases the GIL.
+    
+    Returns a risk table with RISK_TABLE_COLUMNS, highest priority first.
     """
-    risk_areas = []
+    risk_areas = pd.DataFrame(columns=RISK_TABLE_COLUMNS)
+    chunk_tables = []
+    n_workers = workers or os.cpu_count() or 1
+    # Cap the batches held in memory at once
+    max_in_flight = 2 * n_workers
     
     try:
         print(f"🔥 Processing {os.path.basename(gdb_path)} layer '{layer_name}' (optimized)...")
         
-        # First, get total count
-        with fiona.open(gdb_path, layer=layer_name) as src:
-            total_features = len(src)
-            print(f"   Total features: {total_features:,}")
+        # First, get total count and schema from the layer metadata
+        info = pyogrio.read_info(gdb_path, layer=layer_name)
+        total_features = info['features']
+        print(f"   Total features: {total_features:,}")
+        print(f"   Processing with {n_workers} worker threads")
         
-        # Process in chunks to manage memory
-        processed_count = 0
-        chunk_num = 0
+        # Only decode the attribute columns the risk extraction reads
+        layer_fields = set(info['fields'])
+        read_columns = [c for c in READ_COLUMNS if c in layer_fields]
         
-        while processed_count < total_features:
-            chunk_num += 1
-            start_idx = processed_count
-            end_idx = min(start_idx + chunk_size, total_features)
-            
-            print(f"   📦 Processing chunk {chunk_num}: features {start_idx:,} to {end_idx:,}")
-            
+        # The layer CRS is fixed, so decide once whether output needs reprojecting
+        needs_reproject = bool(info['crs']) and info['crs'] not in ('EPSG:4326', 'OGC:CRS84')
+        
+        pending = deque()
+        
+        def collect_oldest():
+            chunk_num, start_idx, end_idx, future = pending.popleft()
+            print(f"   📦 Chunk {chunk_num}: features {start_idx:,} to {end_idx:,}")
             try:
-                # Read chunk
-                gdf_chunk = gpd.read_file(
-                    gdb_path, 
-                    layer=layer_name,
-                    rows=slice(start_idx, end_idx)
-                )
-                
-                # Ensure WGS84 for consistency
-                if gdf_chunk.crs and gdf_chunk.crs != 'EPSG:4326':
-                    gdf_chunk = gdf_chunk.to_crs('EPSG:4326')
-                
-                # Extract bushfire risk features with filtering
-                chunk_risk_areas = extract_risk_features_filtered(gdf_chunk, min_area_hectares)
-                risk_areas.extend(chunk_risk_areas)
-                
+                chunk_risk_areas = future.result()
+                chunk_tables.append(chunk_risk_areas)
                 print(f"      ✅ Found {len(chunk_risk_areas)} significant risk areas in this chunk")
-                
-                # Clear chunk from memory
-                del gdf_chunk
-                
             except Exception as e:
                 print(f"      ⚠️  Skipped chunk {chunk_num} due to error: {e}")
+        
+        # The layer is opened once and streamed as Arrow batches of chunk_size
+        # rows; results are collected in read order, so prioritization ties
+        # resolve the same way on every run
+        with ThreadPoolExecutor(max_workers=n_workers) as executor, \
+                pyogrio.raw.open_arrow(gdb_path, layer=layer_name, columns=read_columns,
+                                       batch_size=chunk_size, use_pyarrow=True) as (meta, reader):
+            geometry_column = meta['geometry_name'] or 'wkb_geometry'
+            start_idx = 0
             
-            processed_count = end_idx
+            for chunk_num, batch in enumerate(reader, 1):
+                end_idx = start_idx + batch.num_rows
+                future = executor.submit(_process_batch, batch, geometry_column, meta['crs'],
+                                         min_area_hectares, needs_reproject)
+                pending.append((chunk_num, start_idx, end_idx, future))
+                if len(pending) >= max_in_flight:
+                    collect_oldest()
+                start_idx = end_idx
+            
+            while pending:
+                collect_oldest()
+        
+        if chunk_tables:
+            risk_areas = pd.concat(chunk_tables, ignore_index=True)
         
         print(f"🎯 Total bushfire risk areas found: {len(risk_areas)}")
         
@@ -134,281 +253,276 @@ def extract_bushfire_risk_areas(gdb_path: str, layer_name: str, chunk_size: int
     
     return risk_areas
 
-def extract_risk_features_filtered(gdf: gpd.GeoDataFrame, min_area_hectares: float) -> List[Dict[str, Any]]:
+def _numeric_column(series: pd.Series) -> pd.Series:
+    """Coerce a column to float, cleaning thousands separators from strings (NaN if unparseable)."""
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        return series.astype(float)
+    cleaned = series.astype(str).str.strip().str.replace(',', '', regex=False)
+    return pd.to_numeric(cleaned.str.replace(' ', '', regex=False), errors='coerce')
+
+def classify_risk_levels(gdf: gpd.GeoDataFrame) -> np.ndarray:
     """
-    Extract bushfire risk features with smart filtering for data centre planning.
+    Risk level per row: the first matching title keyword tier (_RISK_TIERS),
+    else the first area tier reached (_AREA_TIERS), else Minimal for any
+    positive area and Low when the size is unknown.
     """
-    risk_features = []
-    
-    for idx, row in gdf.iterrows():
-        try:
-            # Extract basic info with error handling
-            risk_level = get_risk_level_safe(row)
-            fire_name = get_fire_name_safe(row)
-            status = get_fire_status_safe(row)
-            area_hectares = get_area_info_safe(row)
-            
-            # Filter: Skip very small fires unless they're high risk
-            if area_hectares is not None and area_hectares < min_area_hectares:
-                if risk_level not in ['High', 'Extreme']:
-                    continue  # Skip small, low-risk fires
-            
-            # Filter: Skip "Minimal" risk unless the fire is large
-            if risk_level == 'Minimal' and (area_hectares is None or area_hectares < 1.0):
-                continue
-            
-            # Convert geometry based on type
-            geometry = None
-            if hasattr(row.geometry, '__geo_interface__'):
-                geom = row.geometry.__geo_interface__
-                
-                # For risk assessment, convert to centroid for distance calculations
-                if geom.get('type') in ['Polygon', 'MultiPolygon']:
-                    centroid = row.geometry.centroid
-                    geometry = centroid.__geo_interface__
-                elif geom.get('type') in ['Point', 'MultiPoint']:
-                    geometry = geom
-                else:
-                    # For lines, use centroid
-                    centroid = row.geometry.centroid
-                    geometry = centroid.__geo_interface__
-            
-            if geometry:
-                feature = {
-                    "type": "Feature",
-                    "properties": {
-                        "risk_level": risk_level,
-                        "fire_name": fire_name[:50],  # Truncate long names
-                        "status": status,
-                        "area_hectares": area_hectares,
-                        "original_geometry_type": geom.get('type', 'unknown'),
-                        "data_source": "Operational_Bushfire_Boundaries"
-                    },
-                    "geometry": geometry
-                }
-                risk_features.append(feature)
-                
-        except Exception as e:
-            # Skip problematic features but log specific errors
-            print(f"      ⚠️  Skipped feature due to error: {e}")
-            continue
+    if 'Title' in gdf.columns:
+        title = gdf['Title'].astype(str).str.lower()
+    else:
+        title = pd.Series('', index=gdf.index)
     
-    return risk_features
-
-def get_risk_level_safe(row: pd.Series) -> str:
-    """Extract bushfire risk level with safe string/numeric handling."""
+    if 'Hectares' in gdf.columns:
+        area = _numeric_column(gdf['Hectares']).fillna(0).to_numpy()
+    else:
+        area = np.zeros(len(gdf))
     
-    # Get fire title and area to assess risk
-    title = str(row.get('Title', '')).lower()
-    hectares = row.get('Hectares', 0)
+    conditions = [title.str.contains(pattern, regex=True).to_numpy() for _, pattern in _RISK_TIERS]
+    choices = [level for level, _ in _RISK_TIERS]
     
-    # Safe conversion of hectares to float
-    area = 0
-    try:
-        if hectares is not None and hectares != '' and str(hectares).lower() != 'nan':
-            # Handle string numeric values
-            hectares_str = str(hectares).strip().replace(',', '')
-            if hectares_str and hectares_str != '0':
-                area = float(hectares_str)
-    except (ValueError, TypeError):
-        area = 0
-    
-    # Risk assessment based on size and keywords
-    risk_keywords = {
-        'extreme': ['extreme', 'emergency', 'evacuation', 'catastrophic', 'critical'],
-        'high': ['high', 'severe', 'major', 'large', 'complex', 'significant'],
-        'moderate': ['moderate', 'medium', 'controlled', 'watch'],
-        'low': ['low', 'small', 'contained', 'patrolled', 'monitor']
-    }
+    # Risk assessment based on area (hectares)
+    conditions += [area >= threshold for threshold, _ in _AREA_TIERS] + [area > 0]
+    choices += [level for _, level in _AREA_TIERS] + ['Minimal']
     
-    # Check for risk keywords in title
-    for risk_level, keywords in risk_keywords.items():
-        if any(keyword in title for keyword in keywords):
-            return risk_level.title()
-    
-    # Risk assessment based on area (hectares) - more conservative for data centres
-    if area >= 5000:   # Very large fires (50+ sq km)
-        return "Extreme"
-    elif area >= 500:  # Large fires (5+ sq km)
-        return "High"
-    elif area >= 50:   # Medium fires (0.5+ sq km)
-        return "Moderate"
-    elif area >= 5:    # Small significant fires
-        return "Low"
-    elif area > 0:     # Very small fires
-        return "Minimal"
-    else:
-        return "Low"  # Unknown size defaults to Low for safety
-
-def get_fire_name_safe(row: pd.Series) -> str:
-    """Extract fire incident name safely."""
-    # Try Title field first
-    if 'Title' in row and pd.notna(row['Title']):
-        title = str(row['Title']).strip()
-        if title and title != '' and title.lower() not in ['null', 'nan', 'none']:
-            return title
-    
-    # Fallback to other name fields
-    name_fields = [
-        'FIRE_NAME', 'NAME', 'INCIDENT_NAME', 'EVENT_NAME',
-        'LOCATION', 'AREA_NAME', 'LOCALITY', 'PLACE'
-    ]
+    # Unknown size defaults to Low for safety
+    return np.select(conditions, choices, default='Low').astype(object)
+
+def extract_area_hectares(gdf: gpd.GeoDataFrame, area_fields: List[str] = AREA_FIELDS) -> np.ndarray:
+    """
+    Area in hectares per row: the first parseable, non-empty area field
+    (values over 100,000 are taken as square metres), NaN if none.
+    """
+    area = pd.Series(np.nan, index=gdf.index)
+    resolved = np.zeros(len(gdf), dtype=bool)
     
-    for field in name_fields:
-        if field in row and pd.notna(row[field]):
-            name = str(row[field]).strip()
-            if name and name != '' and name.lower() not in ['null', 'nan', 'none']:
-                return name
+    for field in area_fields:
+        if field not in gdf.columns:
+            continue
+        values = _numeric_column(gdf[field])
+        take = ~resolved & values.notna().to_numpy()
+        area[take] = values[take]
+        resolved |= take
+    
+    area = area.to_numpy()
+    # Convert square meters to hectares if needed (likely in square meters)
+    area = np.where(area > 100000, area / 10000, area)
+    return np.where(area > 0, area, np.nan)
+
+def extract_risk_features_filtered(gdf: gpd.GeoDataFrame, min_area_hectares: float) -> pd.DataFrame:
+    """
+    Extract bushfire risk features with smart filtering for data centre planning.
+    
+    Returns one row per kept feature as a column-oriented risk table
+    (RISK_TABLE_COLUMNS) instead of a list of nested GeoJSON dicts.
+    """
+    # Resolve which candidate fields this layer actually has once, so the
+    # per-row helpers only walk columns that exist
+    name_fields = [f for f in NAME_FIELDS if f in gdf.columns]
+    status_fields = [f for f in STATUS_FIELDS if f in gdf.columns]
+    area_fields = [f for f in AREA_FIELDS if f in gdf.columns]
+    
+    # Risk level, area and the filters run over whole columns, so the Python
+    # loop below only walks surviving rows to resolve names and statuses
+    risk_levels = classify_risk_levels(gdf)
+    areas = extract_area_hectares(gdf, area_fields)
+    
+    # Filter: Skip very small fires unless they're high risk
+    small_low_risk = (areas < min_area_hectares) & ~np.isin(risk_levels, ['High', 'Extreme'])
+    # Filter: Skip "Minimal" risk unless the fire is large
+    minimal = (risk_levels == 'Minimal') & ~(areas >= 1.0)
+    # Rows without a geometry are skipped
+    shapes = gdf.geometry.to_numpy()
+    keep = ~(small_low_risk | minimal) & ~shapely.is_missing(shapes)
+    
+    # Only carry the consumed columns into the row tuples, and bind the
+    # candidate fields to tuple positions so rows are read by index
+    wanted = ['Title'] + name_fields + status_fields
+    columns = list(dict.fromkeys(c for c in wanted if c in gdf.columns))
+    name_positions = [columns.index(f) for f in ['Title'] + name_fields if f in columns]
+    status_positions = [columns.index(f) for f in status_fields]
+    title_position = columns.index('Title') if 'Title' in columns else None
+    
+    # Rows are built from per-column arrays by kept position, so a layer with
+    # none of these columns still yields one (empty) row per kept feature
+    kept_columns = [gdf[c].to_numpy()[keep] for c in columns]
+    fire_names = []
+    statuses = []
+    for i in range(int(keep.sum())):
+        row = tuple(values[i] for values in kept_columns)
+        fire_names.append(get_fire_name_safe(row, name_positions)[:50])  # Truncate long names
+        statuses.append(get_fire_status_safe(row, status_positions, title_position))
+    
+    # For risk assessment, convert polygons and lines to centroids for distance
+    # calculations (points are kept as-is); GEOS computes them in one call
+    shapes = shapes[keep]
+    geom_types = gdf.geom_type.to_numpy()[keep]
+    is_point = np.isin(geom_types, ['Point', 'MultiPoint'])
+    
+    return pd.DataFrame({
+        'risk_level': risk_levels[keep],
+        'risk_code': pd.Series(risk_levels[keep], dtype=object).map(RISK_CODES).to_numpy(dtype=np.int8),
+        'fire_name': fire_names,
+        'status': statuses,
+        'area_hectares': areas[keep],
+        'original_geometry_type': geom_types,
+        'geometry': np.where(is_point, shapes, shapely.centroid(shapes))
+    }, columns=RISK_TABLE_COLUMNS)
+
+def _clean_text(value: Any) -> Optional[str]:
+    """Return a stripped string, or None for missing and null-like values."""
+    # Already-good strings skip the str() coercion entirely
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return None
+    if not isinstance(value, str):
+        if pd.isna(value):
+            return None
+        value = str(value)
+    value = value.strip()
+    if not value or value.lower() in _NULL_STRINGS:
+        return None
+    return value
+
+def get_fire_name_safe(row: tuple, name_positions: List[int]) -> str:
+    """
+    Extract fire incident name safely.
+    
+    name_positions index the Title column first, then the fallback NAME_FIELDS.
+    """
+    for pos in name_positions:
+        name = _clean_text(row[pos])
+        if name is not None:
+            return name
     
     return "Unnamed Fire Area"
 
-def get_fire_status_safe(row: pd.Series) -> str:
-    """Extract fire status safely."""
+def get_fire_status_safe(row: tuple, status_positions: List[int],
+                         title_position: Optional[int] = None) -> str:
+    """Extract fire status safely (fields are read from the given tuple positions)."""
     # Check explicit status fields
-    status_fields = [
-        'STATUS', 'FIRE_STATUS', 'STATE', 'CONDITION',
-        'STAGE', 'PHASE', 'CURRENT_STATUS'
-    ]
-    
-    for field in status_fields:
-        if field in row and pd.notna(row[field]):
-            status = str(row[field]).strip()
-            if status and status.lower() not in ['null', 'nan', 'none', '']:
-                return status
+    for pos in status_positions:
+        status = _clean_text(row[pos])
+        if status is not None:
+            return status
     
     # Infer status from other information
-    agency = str(row.get('Agency', '')).lower()
-    title = str(row.get('Title', '')).lower()
+    title = row[title_position] if title_position is not None else ''
+    if not isinstance(title, str):
+        title = str(title)
+    title = title.lower()
     
     # Status inference from keywords
-    if any(word in title for word in ['controlled', 'contained', 'extinguished']):
+    if STATUS_CONTROLLED_RE.search(title):
         return "Controlled"
-    elif any(word in title for word in ['patrolled', 'patrol', 'monitor']):
+    elif STATUS_PATROL_RE.search(title):
         return "Being Patrolled"
-    elif any(word in title for word in ['emergency', 'evacuation', 'immediate', 'critical']):
+    elif STATUS_EMERGENCY_RE.search(title):
         return "Emergency"
-    elif any(word in title for word in ['active', 'burning', 'going']):
+    elif STATUS_ACTIVE_RE.search(title):
         return "Active"
     else:
         return "Operational"
 
-def get_area_info_safe(row: pd.Series) -> Optional[float]:
-    """Extract area information safely with proper type handling."""
-    area_fields = [
-        'AREA_HA', 'AREA_HECTARES', 'SIZE_HA', 'Hectares',
-        'SHAPE_Area', 'AREA', 'SIZE', 'Shape_Area'
-    ]
-    
-    for field in area_fields:
-        if field in row and pd.notna(row[field]):
-            try:
-                value = row[field]
-                
-                # Handle different data types
-                if isinstance(value, (int, float)):
-                    area = float(value)
-                elif isinstance(value, str):
-                    # Clean string and convert
-                    value_clean = value.strip().replace(',', '').replace(' ', '')
-                    if value_clean and value_clean.lower() not in ['null', 'nan', 'none', '']:
-                        area = float(value_clean)
-                    else:
-                        continue
-                else:
-                    continue
-                
-                # Convert square meters to hectares if needed
-                if area > 100000:  # Likely in square meters
-                    area = area / 10000
-                    
-                return area if area > 0 else None
-                
-            except (ValueError, TypeError, AttributeError):
-                continue
-    
-    return None
-
-def prioritize_risk_areas(risk_areas: List[Dict[str, Any]], max_features: int) -> List[Dict[str, Any]]:
+def prioritize_risk_areas(risk_areas: pd.DataFrame, max_features: int) -> pd.DataFrame:
     """
     Prioritize bushfire risk areas for data centre planning.
     Keep the most relevant features based on risk level and size.
     """
     
-    # Define risk priority scores
-    risk_scores = {
-        'Extreme': 100,
-        'High': 80,
-        'Moderate': 60,
-        'Low': 40,
-        'Minimal': 20
-    }
+    # Scoring inputs straight from the table columns (risk codes were tagged at extraction)
+    risk_codes = risk_areas['risk_code'].to_numpy(dtype=np.int8)
+    areas = risk_areas['area_hectares'].fillna(0).to_numpy(dtype=np.float64)
+    active_flag = (risk_areas['status'] == 'Active').to_numpy(dtype=np.uint8)
     
-    # Score each feature
-    scored_features = []
-    for feature in risk_areas:
-        props = feature['properties']
-        risk_level = props.get('risk_level', 'Low')
-        area = props.get('area_hectares', 0) or 0
-        
-        # Calculate priority score
-        base_score = risk_scores.get(risk_level, 40)
-        area_bonus = min(20, area / 10)  # Up to 20 points for large fires
-        status_bonus = 10 if props.get('status') == 'Active' else 0
-        
-        total_score = base_score + area_bonus + status_bonus
-        
-        scored_features.append((total_score, feature))
+    scores = _score(risk_codes, areas, active_flag)
     
-    # Sort by score (highest first) and take top N
-    scored_features.sort(reverse=True, key=lambda x: x[0])
+    # Partial selection of the top N in O(N); ties at the cut keep input order
+    if 0 < max_features < len(scores):
+        kth = np.partition(scores, len(scores) - max_features)[len(scores) - max_features]
+        above = np.flatnonzero(scores > kth)
+        ties = np.flatnonzero(scores == kth)[:max_features - len(above)]
+        top = np.concatenate([above, ties])
+    else:
+        top = np.arange(len(scores))[:max(max_features, 0)]
+    
+    # Sort only the kept N by score (highest first, ties keep input order)
+    order = top[np.lexsort((top, -scores[top]))]
     
-    return [feature for score, feature in scored_features[:max_features]]
+    return risk_areas.iloc[order].reset_index(drop=True)
+
+def _score(risk_codes: np.ndarray, areas: np.ndarray, active_flag: np.ndarray) -> np.ndarray:
+    """Priority score: risk base (20-100) + up to 20 for large fires + 10 if active."""
+    base_score = 20.0 + 20.0 * risk_codes
+    area_bonus = np.minimum(20.0, areas / 10.0)
+    status_bonus = 10.0 * active_flag
+    return base_score + area_bonus + status_bonus
 
-def save_bushfire_data_optimized(risk_areas: List[Dict[str, Any]], output_file: str):
+def encode_risk_features(risk_areas: pd.DataFrame) -> List[bytes]:
+    """Encode risk table rows as GeoJSON Feature bytes (geometries serialized by GEOS in bulk)."""
+    geometries = shapely.to_geojson(risk_areas['geometry'].to_numpy())
+    areas = risk_areas['area_hectares'].to_numpy(dtype=np.float64)
+    
+    encoded = []
+    for risk_level, fire_name, status, area, geom_type, geometry in zip(
+            risk_areas['risk_level'], risk_areas['fire_name'], risk_areas['status'],
+            areas, risk_areas['original_geometry_type'], geometries):
+        properties = json_dumps({
+            "risk_level": risk_level,
+            "fire_name": fire_name,
+            "status": status,
+            "area_hectares": None if np.isnan(area) else float(area),
+            "original_geometry_type": geom_type,
+            "data_source": "Operational_Bushfire_Boundaries"
+        })
+        encoded.append(b'{"type":"Feature","properties":' + properties +
+                       b',"geometry":' + geometry.encode('utf-8') + b'}')
+    return encoded
+
+def save_bushfire_data_optimized(risk_areas: pd.DataFrame, output_file: str):
     """Save optimized bushfire risk data to GeoJSON file."""
     
-    # Analyze risk levels
-    risk_counts = {}
-    area_stats = {'total': 0, 'with_area': 0, 'max_area': 0}
-    
-    for area in risk_areas:
-        risk = area['properties'].get('risk_level', 'Unknown')
-        risk_counts[risk] = risk_counts.get(risk, 0) + 1
-        
-        # Calculate area statistics
-        area_ha = area['properties'].get('area_hectares')
-        if area_ha is not None:
-            area_stats['with_area'] += 1
-            area_stats['total'] += area_ha
-            area_stats['max_area'] = max(area_stats['max_area'], area_ha)
+    # Analyze risk levels (counts listed in order of first appearance)
+    risks = risk_areas['risk_level'].to_numpy(dtype=str)
+    levels, first_seen, counts = np.unique(risks, return_index=True, return_counts=True)
+    order = np.argsort(first_seen)
+    risk_counts = dict(zip(levels[order].tolist(), counts[order].tolist()))
+    
+    # Calculate area statistics (NaN marks features without an area)
+    areas = risk_areas['area_hectares'].to_numpy(dtype=np.float64)
+    has_area = ~np.isnan(areas)
+    area_stats = {
+        'total': float(areas[has_area].sum()),
+        'with_area': int(has_area.sum()),
+        'max_area': float(areas[has_area].max(initial=0))
+    }
     
     # Create compact output format
-    output_data = {
-        "type": "FeatureCollection",
-        "features": risk_areas,
-        "metadata": {
-            "description": "Optimized bushfire risk dataset for data centre site analysis",
-            "version": "2.0",
-            "extraction_date": datetime.now().strftime("%Y-%m-%d"),
-            "purpose": "Infrastructure risk assessment - data centre location planning",
-            "total_features": len(risk_areas),
-            "risk_level_summary": risk_counts,
-            "area_statistics": {
-                "features_with_area": area_stats['with_area'],
-                "total_area_hectares": round(area_stats['total'], 2),
-                "largest_fire_hectares": round(area_stats['max_area'], 2)
-            },
-            "filtering_applied": {
-                "minimum_area_threshold": "0.01 hectares",
-                "excluded_minimal_risk": "fires < 1 hectare",
-                "prioritization": "risk level + size + status"
-            }
+    metadata = {
+        "description": "Optimized bushfire risk dataset for data centre site analysis",
+        "version": "2.0",
+        "extraction_date": datetime.now().strftime("%Y-%m-%d"),
+        "purpose": "Infrastructure risk assessment - data centre location planning",
+        "total_features": len(risk_areas),
+        "risk_level_summary": risk_counts,
+        "area_statistics": {
+            "features_with_area": area_stats['with_area'],
+            "total_area_hectares": round(area_stats['total'], 2),
+            "largest_fire_hectares": round(area_stats['max_area'], 2)
+        },
+        "filtering_applied": {
+            "minimum_area_threshold": "0.01 hectares",
+            "excluded_minimal_risk": "fires < 1 hectare",
+            "prioritization": "risk level + size + status"
         }
     }
     
     try:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(output_data, f, separators=(',', ':'))
+        # Features go from the table straight to bytes, without an
+        # intermediate list of nested GeoJSON dicts
+        with open(output_file, 'wb') as f:
+            f.write(b'{"type":"FeatureCollection","features":[')
+            f.write(b','.join(encode_risk_features(risk_areas)))
+            f.write(b'],"metadata":')
+            f.write(json_dumps(metadata))
+            f.write(b'}')
         
         file_size = os.path.getsize(output_file) / 1024 / 1024
         print(f"\n✅ Successfully created optimized bushfire dataset: {output_file}")
@@ -431,6 +545,41 @@ def save_bushfire_data_optimized(risk_areas: List[Dict[str, Any]], output_file:
     except Exception as e:
         print(f"❌ Error writing output file: {e}")
 
+def risk_table_to_geodataframe(risk_areas: pd.DataFrame) -> gpd.GeoDataFrame:
+    """Risk table -> WGS84 GeoDataFrame with the same properties as the GeoJSON output."""
+    return gpd.GeoDataFrame(risk_areas.drop(columns='risk_code')
+                            .assign(data_source="Operational_Bushfire_Boundaries"),
+                            geometry='geometry', crs='EPSG:4326')
+
+def save_bushfire_data_binary(risk_areas: pd.DataFrame, output_file: str,
+                              output_format: str) -> Optional[str]:
+    """
+    Save bushfire risk data as FlatGeobuf ('fgb') or GeoParquet ('parquet').
+    
+    Both are binary and much smaller than GeoJSON; FlatGeobuf stores a packed
+    Hilbert R-tree with the features, so downstream proximity queries can do
+    indexed bbox reads, GeoParquet is columnar and compressed.
+    """
+    binary_file = os.path.splitext(output_file)[0] + '.' + output_format
+    
+    try:
+        gdf = risk_table_to_geodataframe(risk_areas)
+        if output_format == 'parquet':
+            gdf.to_parquet(binary_file)
+        else:
+            pyogrio.write_dataframe(gdf, binary_file, driver='FlatGeobuf',
+                                    layer_options={'SPATIAL_INDEX': 'YES'})
+        
+        file_size = os.path.getsize(binary_file) / 1024 / 1024
+        print(f"\n✅ Successfully created optimized bushfire dataset: {binary_file}")
+        print(f"📊 Contains {len(risk_areas):,} bushfire risk areas")
+        print(f"📁 File size: {file_size:.2f} MB")
+        return binary_file
+        
+    except Exception as e:
+        print(f"❌ Error writing output file: {e}")
+        return None
+
 def main():
     parser = argparse.ArgumentParser(description='Extract optimized bushfire risk data for data centre analysis')
     parser.add_argument('--input', '-i', 
@@ -447,6 +596,13 @@ def main():
                        help='Maximum features to keep (default: 200)')
     parser.add_argument('--inspect', action='store_true',
                        help='Just inspect the GDB file structure without processing')
+    parser.add_argument('--workers', type=int, default=None,
+                       help='Worker threads for chunk processing (default: CPU count)')
+    parser.add_argument('--format', choices=['geojson', 'fgb', 'parquet'], default='geojson',
+                       help='Output format: GeoJSON, FlatGeobuf or GeoParquet (binary formats '
+                            'replace the output file extension; default: geojson)')
+    parser.add_argument('--spatial-index', action='store_true',
+                       help='Also write an R-tree indexed FlatGeobuf copy (.fgb) for proximity queries')
     
     args = parser.parse_args()
     
@@ -510,20 +666,28 @@ def main():
         layer_name, 
         args.chunk_size,
         args.min_area,
-        args.max_features
+        args.max_features,
+        args.workers
     )
     
-    if risk_areas:
+    if len(risk_areas):
         # Save optimized results
-        save_bushfire_data_optimized(risk_areas, args.output)
+        if args.format == 'geojson':
+            save_bushfire_data_optimized(risk_areas, args.output)
+        else:
+            save_bushfire_data_binary(risk_areas, args.output, args.format)
+        
+        # The FlatGeobuf output is the spatially indexed copy
+        if args.spatial_index and args.format != 'fgb':
+            save_bushfire_data_binary(risk_areas, args.output, 'fgb')
         
         # Show sample results
         print(f"\n📋 Sample high-priority bushfire risk areas:")
-        for i, area in enumerate(risk_areas[:3], 1):
-            name = area['properties'].get('fire_name', 'Unnamed')[:35]
-            risk = area['properties'].get('risk_level', 'Unknown')
-            area_ha = area['properties'].get('area_hectares')
-            area_str = f"{area_ha:.2f}ha" if area_ha else "unknown size"
+        for i, area in enumerate(risk_areas.head(3).itertuples(index=False), 1):
+            name = area.fire_name[:35]
+            risk = area.risk_level
+            area_ha = area.area_hectares
+            area_str = f"{area_ha:.2f}ha" if pd.notna(area_ha) and area_ha else "unknown size"
             print(f"   {i}. {name} | Risk: {risk} | Size: {area_str}")
         
         if len(risk_areas) > 3:
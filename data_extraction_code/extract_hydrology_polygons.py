@@ -9,14 +9,16 @@ for better representation of water boundaries and areas.
 import json
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Dict, Any, Optional
 import argparse
 
 try:
     import geopandas as gpd
     import pandas as pd
+    import numpy as np
     import fiona
-    from shapely.geometry import shape
+    import pyogrio
     HAS_GEOPANDAS = True
 except ImportError:
     HAS_GEOPANDAS = False
@@ -24,6 +26,39 @@ except ImportError:
     print("Please install with: pip install geopandas")
     sys.exit(1)
 
+# Output property -> (source column, value used when the column or value is missing)
+HYDRO_PROPERTY_COLUMNS = {
+    'feature_type': ('FEATURETYPE', 'Unknown'),
+    'type': ('TYPE', ''),
+    'name': ('NAME', ''),
+    'perenniality': ('PERENNIALITY', ''),
+    'hierarchy': ('HIERARCHY', ''),
+    'dimension': ('DIMENSION', ''),
+    'reliability': ('FEATURERELIABILITY', ''),
+    'source': ('FEATURESOURCE', ''),
+}
+
+def _process_hydrology_chunk(chunk: 'gpd.GeoDataFrame', start: int,
+                             min_area: float) -> 'gpd.GeoDataFrame':
+    """Filter one slice of the layer (starting at row start) and build its output columns (runs in a worker)."""
+    # Features whose area can't be computed (missing geometry) have nothing
+    # to write, so they are dropped along with the small ones
+    areas = chunk.geometry.area.to_numpy()
+    keep = areas >= min_area
+    chunk = chunk[keep]
+    areas = areas[keep]
+    
+    columns = {'id': np.flatnonzero(keep) + start}
+    for prop, (column, default) in HYDRO_PROPERTY_COLUMNS.items():
+        if column in chunk.columns:
+            columns[prop] = chunk[column].fillna(default).astype(str).to_numpy()
+        else:
+            columns[prop] = np.full(len(chunk), default, dtype=object)
+    # Convert to hectares (approximate) - rough conversion from degrees
+    columns['area_estimate_ha'] = np.round(areas / 10000, 3)
+    
+    return gpd.GeoDataFrame(columns, geometry=chunk.geometry.to_numpy(), crs=chunk.crs)
+
 def inspect_hydrology_layer(gdb_path: str, layer_name: str):
     """Inspect the hydrology layer to understand water body types."""
     try:
@@ -75,7 +110,9 @@ def extract_hydrology_polygons(gdb_path: str, layer_name: str,
                               output_file: str = "map_data/hydrology_polygons.geojson",
                               chunk_size: int = 5000,
                               feature_filter: Optional[Dict[str, List[str]]] = None,
-                              max_features: int = 50000) -> bool:
+                              max_features: int = 50000,
+                              output_format: str = 'geojson',
+                              workers: Optional[int] = None) -> bool:
     """
     Extract hydrology polygons with filtering for relevant water bodies.
     
@@ -83,9 +120,12 @@ def extract_hydrology_polygons(gdb_path: str, layer_name: str,
         gdb_path: Path to GDB file
         layer_name: Layer to process
         output_file: Output GeoJSON file path
-        chunk_size: Features per chunk for memory management
+        chunk_size: Features per chunk (one unit of work per worker task)
         feature_filter: Dictionary of property filters
         max_features: Maximum features to extract
+        output_format: 'geojson' for a FeatureCollection or 'geojsonl' for
+            newline-delimited features (GeoJSONSeq)
+        workers: Worker processes for chunk processing (defaults to CPU count)
     """
     
     # Filter for significant water bodies - simpler approach based on actual data
@@ -103,119 +143,74 @@ def extract_hydrology_polygons(gdb_path: str, layer_name: str,
         # Ensure output directory exists
         os.makedirs(os.path.dirname(output_file), exist_ok=True)
         
-        extracted_features = []
-        total_processed = 0
-        total_matched = 0
+        min_area = feature_filter.get('min_area_threshold', 0.001)
         
-        # Process in chunks to manage memory
-        with fiona.open(gdb_path, layer=layer_name) as src:
-            total_features = len(src)
-            print(f"   Total features in layer: {total_features:,}")
-            
-            for i in range(0, min(total_features, max_features), chunk_size):
-                end_idx = min(i + chunk_size, total_features, max_features)
-                chunk_num = (i // chunk_size) + 1
-                total_chunks = min(total_features, max_features) // chunk_size + 1
-                
-                print(f"   📦 Processing chunk {chunk_num}/{total_chunks}: features {i:,} to {end_idx:,}")
-                
-                # Read chunk
-                chunk_features = []
-                feature_idx = 0
-                
-                for feature in src:
-                    if feature_idx < i:
-                        feature_idx += 1
-                        continue
-                    if feature_idx >= end_idx:
-                        break
-                        
-                    props = feature['properties']
-                    
-                    # Simple filtering based on area and basic criteria
-                    match = True
-                    
-                    # Filter by area if geometry is available
-                    try:
-                        geom = shape(feature['geometry'])
-                        area = geom.area
-                        if area < feature_filter.get('min_area_threshold', 0.001):
-                            match = False
-                    except:
-                        # If we can't calculate area, include the feature
-                        pass
-                    
-                    if match:
-                        # Calculate area if possible
-                        try:
-                            geom = shape(feature['geometry'])
-                            # Convert to hectares (approximate)
-                            area_ha = geom.area / 10000  # Rough conversion from degrees to hectares
-                            area_estimate = round(area_ha, 3)
-                        except:
-                            area_estimate = None
-                        
-                        # Create GeoJSON feature
-                        # Ensure geometry is in dict format for JSON serialization
-                        if hasattr(feature['geometry'], '__geo_interface__'):
-                            geometry_dict = feature['geometry'].__geo_interface__
-                        else:
-                            geometry_dict = feature['geometry']
-                        
-                        geojson_feature = {
-                            "type": "Feature",
-                            "geometry": geometry_dict,
-                            "properties": {
-                                "id": f"hydro_{feature_idx}",
-                                "feature_type": str(props.get('FEATURETYPE', 'Unknown')),
-                                "type": str(props.get('TYPE', '')),
-                                "name": str(props.get('NAME', '') or ''),
-                                "perenniality": str(props.get('PERENNIALITY', '') or ''),
-                                "hierarchy": str(props.get('HIERARCHY', '') or ''),
-                                "dimension": str(props.get('DIMENSION', '') or ''),
-                                "reliability": str(props.get('FEATURERELIABILITY', '') or ''),
-                                "source": str(props.get('FEATURESOURCE', '') or ''),
-                                "area_estimate_ha": area_estimate
-                            }
-                        }
-                        
-                        chunk_features.append(geojson_feature)
-                        total_matched += 1
-                    
-                    feature_idx += 1
-                    total_processed += 1
-                
-                extracted_features.extend(chunk_features)
-                print(f"     Found {len(chunk_features)} matching features in this chunk")
-                
-                # Stop if we've reached max features
-                if len(extracted_features) >= max_features:
-                    print(f"   ⚠️  Reached maximum feature limit ({max_features})")
-                    extracted_features = extracted_features[:max_features]
-                    break
+        info = pyogrio.read_info(gdb_path, layer=layer_name)
+        total_features = info['features']
+        print(f"   Total features in layer: {total_features:,}")
+        
+        # Read the layer once, then shard the rows across worker processes so
+        # area computation and property building run in parallel
+        limit = min(total_features, max_features)
+        source = pyogrio.read_dataframe(gdb_path, layer=layer_name, max_features=limit)
+        shards = [rows for rows in np.array_split(np.arange(len(source)),
+                                                  max(1, -(-len(source) // chunk_size)))
+                  if len(rows)]
+        n_workers = workers or os.cpu_count() or 1
+        print(f"   Processing {len(shards)} chunks with {n_workers} workers")
+        
+        chunk_results = []
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            futures = [
+                executor.submit(_process_hydrology_chunk, source.iloc[rows], int(rows[0]), min_area)
+                for rows in shards
+            ]
+            for chunk_num, (rows, future) in enumerate(zip(shards, futures), 1):
+                chunk_gdf = future.result()
+                print(f"   📦 Chunk {chunk_num}/{len(shards)}: features {rows[0]:,} to {rows[-1] + 1:,}"
+                      f" - {len(chunk_gdf)} matching")
+                chunk_results.append(chunk_gdf)
+        
+        if chunk_results:
+            gdf = gpd.GeoDataFrame(pd.concat(chunk_results, ignore_index=True),
+                                   geometry='geometry', crs=info['crs'])
+        else:
+            gdf = gpd.GeoDataFrame({'id': []}, geometry=gpd.GeoSeries([]), crs=info['crs'])
         
         print(f"\n✅ Extraction complete:")
-        print(f"   Processed: {total_processed:,} features")
-        print(f"   Matched filters: {total_matched:,} features")
-        print(f"   Final output: {len(extracted_features):,} features")
+        print(f"   Processed: {limit:,} features")
+        print(f"   Matched filters: {len(gdf):,} features")
         
-        # Create GeoJSON
-        geojson_data = {
-            "type": "FeatureCollection",
-            "features": extracted_features,
-            "metadata": {
+        # Let GDAL serialize the output: coordinates are formatted in C and
+        # trimmed to 6 decimals (~0.1 m) instead of going through json.dump
+        if output_format == 'geojsonl':
+            # One feature per line, no FeatureCollection wrapper, so consumers
+            # can stream-read the file (GeoJSONSeq always writes WGS84)
+            pyogrio.write_dataframe(gdf, output_file, driver='GeoJSONSeq',
+                                    layer_options={'COORDINATE_PRECISION': '6'})
+        else:
+            # Same top-level "metadata" member as the other extractors' output,
+            # added by GDAL as a FeatureCollection foreign member (GDAL >= 3.9;
+            # older GDAL gets it as a sidecar file next to the output instead)
+            metadata = {
                 "source": os.path.basename(gdb_path),
                 "layer": layer_name,
-                "total_processed": total_processed,
-                "total_matched": total_matched,
+                "total_processed": limit,
+                "total_matched": len(gdf),
                 "extraction_date": pd.Timestamp.now().isoformat(),
                 "filters_applied": feature_filter
             }
-        }
-        
-        # Write output
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(geojson_data, f, indent=2, ensure_ascii=False)
+            layer_options = {'COORDINATE_PRECISION': '6',
+                             'RFC7946': 'YES',
+                             'WRITE_BBOX': 'YES'}
+            if pyogrio.__gdal_version__ >= (3, 9, 0):
+                layer_options['FOREIGN_MEMBERS_COLLECTION'] = json.dumps({"metadata": metadata},
+                                                                         ensure_ascii=False)
+            pyogrio.write_dataframe(gdf, output_file, driver='GeoJSON',
+                                    layer_options=layer_options)
+            if 'FOREIGN_MEMBERS_COLLECTION' not in layer_options:
+                with open(f"{output_file}.metadata.json", 'w', encoding='utf-8') as f:
+                    json.dump(metadata, f, indent=2, ensure_ascii=False)
         
         # Show file size
         file_size_mb = os.path.getsize(output_file) / (1024 * 1024)
@@ -243,6 +238,10 @@ def main():
                        help='Maximum features to extract')
     parser.add_argument('--chunk-size', type=int, default=5000,
                        help='Chunk size for processing')
+    parser.add_argument('--format', choices=['geojson', 'geojsonl'], default='geojson',
+                       help='Output format: FeatureCollection or newline-delimited GeoJSON')
+    parser.add_argument('--workers', type=int, default=None,
+                       help='Worker processes for chunk processing (default: CPU count)')
     
     args = parser.parse_args()
     
@@ -258,7 +257,9 @@ def main():
             layer_name=args.layer,
             output_file=args.output,
             chunk_size=args.chunk_size,
-            max_features=args.max_features
+            max_features=args.max_features,
+            output_format=args.format,
+            workers=args.workers
         )
         
         if success:
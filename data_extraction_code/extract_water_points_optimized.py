@@ -10,14 +10,25 @@ Focus: Extract water body POINTS for distance calculations to data centre sites.
 
 import json
 import os
+import re
 import sys
-from typing import List, Dict, Any, Optional
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import List, Dict, Any, Iterable, Iterator, Optional
 import argparse
 
 try:
     import geopandas as gpd
     import pandas as pd
+    import numpy as np
+    import shapely
+    from pyproj import CRS, Transformer
     import fiona
+    import pyogrio
+    import pyogrio.raw
+    import pyarrow as pa
+    import pyarrow.compute as pc
     HAS_GEOPANDAS = True
 except ImportError:
     HAS_GEOPANDAS = False
@@ -25,6 +36,52 @@ except ImportError:
     print("Please install with: pip install geopandas")
     sys.exit(1)
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# FEATURETYPE values that are water bodies in their own right
+WATER_FEATURETYPES = frozenset({'Lake', 'Swamp', 'Reservoir Area', 'Dam', 'Waterhole', 'Wetland', 'Watercourse'})
+
+# Water-related keywords to look for in any text property
+WATER_KEYWORDS = (
+    'water', 'lake', 'river', 'stream', 'pond', 'reservoir', 'dam',
+    'waterway', 'canal', 'creek', 'bay', 'ocean', 'sea', 'lagoon',
+    'wetland', 'swamp', 'marsh', 'spring', 'aquifer'
+)
+
+# Candidate name / id columns, checked in order
+NAME_FIELDS = ('name', 'Name', 'NAME', 'feature_name', 'FEATURE_NAME', 'FEATNAME', 'TEXT_')
+ID_FIELDS = ('id', 'ID', 'objectid', 'OBJECTID', 'fid', 'FID', 'HYDRO_ID')
+
+# Geographic CRSs treated as WGS84 as-is: GDA94 and GDA2020 differ from WGS84 by
+# around a metre or two, which doesn't matter for distance-to-water analysis
+WGS84_COMPATIBLE_EPSG = (4283, 7844, 4326)
+
+# Non-text columns that end up in the output properties
+PROPERTY_FIELDS = ('SHAPE_Area', 'SHAPE_Length', 'HIERARCHY', 'PERENNIALITY')
+
+# Drivers whose attribute filters are SQLite SQL (case-insensitive LIKE, no ILIKE);
+# the rest use OGR SQL, where LIKE is case-sensitive and ILIKE is not
+SQLITE_DRIVERS = frozenset({'GPKG', 'SQLite'})
+
+# GEOS geometry type ids (shapely.get_type_id) of the supported geometry kinds
+GEOMETRY_TYPE_NAMES = {0: 'Point', 1: 'LineString', 3: 'Polygon',
+                       4: 'MultiPoint', 5: 'MultiLineString', 6: 'MultiPolygon'}
+POLYGON_TYPE_IDS = [3, 6]
+LINE_TYPE_IDS = [1, 5]
+POINT_TYPE_ID = 0
+MULTIPOINT_TYPE_ID = 4
+
+# Default margin around candidate sites when prefiltering by bounding box
+# (2 degrees is roughly 200 km at Australian latitudes)
+SITE_MARGIN_DEGREES = 2.0
+
+# Binary output formats by file extension; anything else is written as GeoJSON
+TABLE_FORMATS = {'.parquet': 'Parquet', '.gpkg': 'GPKG'}
+
 def inspect_gdb_layers(gdb_path: str):
     """Inspect the layers in a GDB file to understand its structure."""
     try:
@@ -63,220 +120,530 @@ def inspect_gdb_layers(gdb_path: str):
         print(f"Error inspecting {gdb_path}: {e}")
         return []
 
-def extract_water_points_chunked(gdb_path: str, layer_name: str, chunk_size: int = 5000) -> List[Dict[str, Any]]:
+def build_read_filter(info: Dict[str, Any], water_keywords: List[str]) -> tuple:
     """
-    Extract water points using chunked processing to manage memory usage.
+    Build the (columns, where) arguments that let GDAL skip non-water features.
+    
+    A feature can only be water if one of its text fields contains a keyword
+    (every WATER_FEATURETYPES value does too), so the where clause ORs a
+    case-insensitive match per text field and keyword. It selects a superset:
+    the exact classification still happens in Python on what comes back. Only
+    text fields and fields used in the output are read.
     """
-    water_features = []
+    like = 'LIKE' if info.get('driver') in SQLITE_DRIVERS else 'ILIKE'
+    text_fields = [field for field, dtype in zip(info['fields'], info['dtypes']) if dtype == 'object']
+    wanted = set(NAME_FIELDS) | set(ID_FIELDS) | set(PROPERTY_FIELDS)
+    columns = [field for field in info['fields'] if field in text_fields or field in wanted]
+    
+    where = " OR ".join(
+        f"\"{field}\" {like} '%{keyword}%'" for field in text_fields for keyword in water_keywords
+    )
+    return columns, where or None
+
+def wgs84_transformer(crs: Any) -> Optional['Transformer']:
+    """
+    Transformer from the layer CRS to WGS84, or None when no reprojection is
+    needed (no CRS, or WGS84 / a WGS84-compatible geographic CRS).
+    """
+    if not crs:
+        return None
+    source = CRS.from_user_input(crs)
+    if source.is_geographic and source.to_epsg() in WGS84_COMPATIBLE_EPSG:
+        return None
+    return Transformer.from_crs(source, 'EPSG:4326', always_xy=True)
+
+def load_sites_bbox(sites_path: str, margin: float = SITE_MARGIN_DEGREES) -> tuple:
+    """
+    WGS84 bounding box (minx, miny, maxx, maxy) of all features in a sites
+    file, expanded by margin degrees on every side.
+    """
+    sites = gpd.read_file(sites_path)
+    if sites.crs is not None:
+        sites = sites.to_crs('EPSG:4326')
+    minx, miny, maxx, maxy = sites.total_bounds
+    if not np.isfinite([minx, miny, maxx, maxy]).all():
+        raise ValueError(f"No site geometries found in {sites_path}")
+    return (max(minx - margin, -180.0), max(miny - margin, -90.0),
+            min(maxx + margin, 180.0), min(maxy + margin, 90.0))
+
+def layer_bbox(bbox: tuple, crs: Any) -> tuple:
+    """Convert a WGS84 bounding box to the layer CRS (unchanged when used as WGS84)."""
+    if wgs84_transformer(crs) is None:
+        return tuple(bbox)
+    return Transformer.from_crs('EPSG:4326', CRS.from_user_input(crs),
+                                always_xy=True).transform_bounds(*bbox)
+
+def keyword_mask(batch, water_keywords: List[str]) -> 'pa.Array':
+    """
+    Arrow-side keyword pre-filter: True where any text column contains a
+    keyword (case-insensitive). Like the GDAL where clause it is a superset of
+    the water features, so WKB decoding and DataFrame construction can be
+    limited to these rows.
+    """
+    pattern = "|".join(map(re.escape, water_keywords))
+    mask = pa.array(np.zeros(batch.num_rows, dtype=bool))
+    for field in batch.schema:
+        if pa.types.is_string(field.type) or pa.types.is_large_string(field.type):
+            matched = pc.match_substring_regex(batch.column(field.name), pattern, ignore_case=True)
+            mask = pc.or_(mask, pc.fill_null(matched, False))
+    return mask
+
+def _process_batch(batch, geometry_column: str, fid_column: str, crs: Any,
+                   water_keywords: List[str],
+                   transformer: Optional['Transformer'] = None, as_table: bool = False) -> Any:
+    """
+    Decode one Arrow batch and return its water features, as feature dicts or
+    as a water_feature_table (runs in a worker thread).
+    """
+    # Drop non-matching rows while still in Arrow, before any decoding
+    batch = batch.filter(keyword_mask(batch, water_keywords))
+    
+    # Geometries stay WKB in the Arrow batch until decoded in one call;
+    # the index is the layer's feature id, used as the fallback id
+    attributes = batch.drop_columns([geometry_column, fid_column]).to_pandas()
+    attributes.index = pd.Index(batch.column(fid_column).to_numpy())
+    geometries = shapely.from_wkb(batch.column(geometry_column).to_numpy(zero_copy_only=False))
+    gdf_chunk = gpd.GeoDataFrame(attributes, geometry=geometries, crs=crs)
+    
+    # Filter for water features (output points are reprojected to WGS84 there)
+    table = water_feature_table(gdf_chunk, water_keywords, transformer)
+    return table if as_table else table_to_features(table)
+
+def iter_water_feature_batches(gdb_path: str, layer_name: str, chunk_size: int = 5000,
+                               workers: Optional[int] = None,
+                               bbox: Optional[tuple] = None,
+                               as_tables: bool = False) -> Iterator[Any]:
+    """
+    Yield the water features of each chunk in read order, so callers can write
+    them out without holding the whole layer's features in memory. Chunks are
+    lists of GeoJSON feature dicts, or water_feature_table GeoDataFrames if
+    as_tables is set (for the binary writers, which need no dicts).
+    
+    If bbox (WGS84 minx, miny, maxx, maxy) is given, GDAL only returns features
+    intersecting it, using the layer's spatial index where there is one.
     
-    # Water-related keywords to look for
-    water_keywords = [
-        'water', 'lake', 'river', 'stream', 'pond', 'reservoir', 'dam', 
-        'waterway', 'canal', 'creek', 'bay', 'ocean', 'sea', 'lagoon',
-        'wetland', 'swamp', 'marsh', 'spring', 'aquifer'
-    ]
+    Batches are read on the calling thread (a GDAL dataset must not be shared
+    between threads) and processed by a thread pool; WKB decoding, reprojection,
+    keyword matching and centroids spend most of their time in C code that
+    releases the GIL.
+    """
+    total_water_features = 0
+    water_keywords = list(WATER_KEYWORDS)
+    n_workers = workers or os.cpu_count() or 1
+    # Cap the batches held in memory at once
+    max_in_flight = 2 * n_workers
     
     try:
         print(f"🔄 Processing {os.path.basename(gdb_path)} layer '{layer_name}' in chunks...")
         
         # First, get total count
-        with fiona.open(gdb_path, layer=layer_name) as src:
-            total_features = len(src)
-            print(f"   Total features: {total_features:,}")
+        info = pyogrio.read_info(gdb_path, layer=layer_name)
+        total_features = info['features']
+        print(f"   Total features: {total_features:,}")
+        print(f"   Processing with {n_workers} worker threads")
         
-        # Process in chunks to manage memory
-        processed_count = 0
-        chunk_num = 0
+        # Decide on reprojection once; the same transformer serves every chunk
+        transformer = wgs84_transformer(info['crs'])
+        if transformer is None:
+            print(f"   CRS {info['crs']} used as WGS84, no reprojection")
         
-        while processed_count < total_features:
-            chunk_num += 1
-            start_idx = processed_count
-            end_idx = min(start_idx + chunk_size, total_features)
-            
+        columns, where = build_read_filter(info, water_keywords)
+        print(f"   Reading {len(columns)} of {len(info['fields'])} fields, "
+              f"filtering text fields for water keywords in GDAL")
+        
+        read_bbox = None
+        if bbox is not None:
+            read_bbox = layer_bbox(bbox, info['crs'])
+            print(f"   Limiting read to bounding box {tuple(round(v, 4) for v in bbox)}")
+        
+        pending = deque()
+        
+        def collect_oldest() -> Any:
+            chunk_num, start_idx, end_idx, future = pending.popleft()
             print(f"   📦 Processing chunk {chunk_num}: features {start_idx:,} to {end_idx:,}")
-            
             try:
-                # Read chunk using row selection
-                gdf_chunk = gpd.read_file(
-                    gdb_path, 
-                    layer=layer_name,
-                    rows=slice(start_idx, end_idx)
-                )
-                
-                # Ensure WGS84 for distance calculations
-                if gdf_chunk.crs and gdf_chunk.crs != 'EPSG:4326':
-                    gdf_chunk = gdf_chunk.to_crs('EPSG:4326')
-                
-                # Filter for water features
-                chunk_water_features = filter_water_features(gdf_chunk, water_keywords)
-                water_features.extend(chunk_water_features)
-                
+                chunk_water_features = future.result()
                 print(f"      ✅ Found {len(chunk_water_features)} water features in this chunk")
-                
-                # Clear chunk from memory
-                del gdf_chunk
-                
+                return chunk_water_features
             except Exception as e:
                 print(f"      ❌ Error processing chunk {chunk_num}: {e}")
+                return []
+        
+        # Stream the layer once as Arrow record batches instead of re-opening
+        # the GDB for every row slice
+        with ThreadPoolExecutor(max_workers=n_workers) as executor, \
+                pyogrio.raw.open_arrow(gdb_path, layer=layer_name, batch_size=chunk_size,
+                                       columns=columns, where=where, bbox=read_bbox,
+                                       return_fids=True,
+                                       use_pyarrow=True) as (meta, reader):
+            geometry_column = meta['geometry_name'] or 'wkb_geometry'
+            fid_column = meta['fid_column'] or 'OGC_FID'
+            start_idx = 0
             
-            processed_count = end_idx
+            for chunk_num, batch in enumerate(reader, 1):
+                end_idx = start_idx + batch.num_rows
+                future = executor.submit(_process_batch, batch, geometry_column,
+                                         fid_column, meta['crs'], water_keywords, transformer,
+                                         as_tables)
+                pending.append((chunk_num, start_idx, end_idx, future))
+                if len(pending) >= max_in_flight:
+                    chunk_water_features = collect_oldest()
+                    total_water_features += len(chunk_water_features)
+                    yield chunk_water_features
+                start_idx = end_idx
+            
+            while pending:
+                chunk_water_features = collect_oldest()
+                total_water_features += len(chunk_water_features)
+                yield chunk_water_features
         
-        print(f"🎯 Total water features extracted: {len(water_features)}")
+        print(f"🎯 Total water features extracted: {total_water_features}")
         
     except Exception as e:
         print(f"Error in chunked processing: {e}")
-    
+
+def extract_water_points_chunked(gdb_path: str, layer_name: str, chunk_size: int = 5000,
+                                 workers: Optional[int] = None,
+                                 bbox: Optional[tuple] = None) -> List[Dict[str, Any]]:
+    """
+    Extract water points using chunked processing to manage memory usage.
+    """
+    water_features = []
+    for chunk_water_features in iter_water_feature_batches(gdb_path, layer_name, chunk_size,
+                                                           workers, bbox):
+        water_features.extend(chunk_water_features)
     return water_features
 
-def filter_water_features(gdf: gpd.GeoDataFrame, water_keywords: List[str]) -> List[Dict[str, Any]]:
+def water_feature_table(gdf: gpd.GeoDataFrame, water_keywords: List[str],
+                        transformer: Optional['Transformer'] = None) -> gpd.GeoDataFrame:
     """
-    Filter a GeoDataFrame for water-related features and convert to simple format.
+    Filter a GeoDataFrame for water-related features and return them as a
+    table: the output properties as columns and the output point (or
+    multipoint) as the geometry, in WGS84.
+    
+    If a transformer is given, only the output points are reprojected with it;
+    centroids are computed in the source CRS.
     """
+    # Classify every row at once, then only work on the water features
+    is_water, water_types = classify_water_features(gdf, water_keywords)
+    
+    filtered = gdf[is_water]
+    water_types = water_types[is_water]
+    
+    # Name and id columns are resolved per column rather than per row
+    names = first_valid_values(filtered, NAME_FIELDS, "Unnamed Water Body")
+    ids = first_valid_values(filtered, ID_FIELDS, filtered.index.tolist())
+    geometries = filtered.geometry.to_numpy()
+    
+    # Geometry kinds by GEOS type id; missing and empty geometries have no
+    # location to measure from, so they get -1 and are skipped
+    type_ids = np.where(shapely.is_empty(geometries), -1, shapely.get_type_id(geometries))
+    is_polygon = np.isin(type_ids, POLYGON_TYPE_IDS)
+    is_line = np.isin(type_ids, LINE_TYPE_IDS)
+    
+    is_point = type_ids == POINT_TYPE_ID
+    is_multipoint = type_ids == MULTIPOINT_TYPE_ID
+    
+    # One output x/y per feature: polygon centroids from a single GEOS call,
+    # point coordinates read straight out
+    point_x = np.full(len(filtered), np.nan)
+    point_y = np.full(len(filtered), np.nan)
+    if is_polygon.any():
+        centroids = shapely.centroid(geometries[is_polygon])
+        point_x[is_polygon] = shapely.get_x(centroids)
+        point_y[is_polygon] = shapely.get_y(centroids)
+    if is_point.any():
+        point_x[is_point] = shapely.get_x(geometries[is_point])
+        point_y[is_point] = shapely.get_y(geometries[is_point])
+    
+    # Lines only need a representative point for distance calculations, so use
+    # the mean of their vertices: one NumPy reduction, no per-geometry GEOS work
+    if is_line.any():
+        point_x[is_line], point_y[is_line] = vertex_means(geometries[is_line])
+    
+    # MultiPoints keep all their points
+    coords = np.empty((0, 2))
+    index = np.empty(0, dtype=int)
+    if is_multipoint.any():
+        coords, index = shapely.get_coordinates(geometries[is_multipoint], return_index=True)
+    
+    # Reproject every output coordinate of the chunk in a single PROJ call
+    if transformer is not None:
+        all_x, all_y = transformer.transform(np.concatenate([point_x, coords[:, 0]]),
+                                             np.concatenate([point_y, coords[:, 1]]))
+        n_points = len(point_x)
+        point_x, point_y = all_x[:n_points], all_y[:n_points]
+        coords = np.column_stack([all_x[n_points:], all_y[n_points:]])
+    
+    output_geometries = shapely.points(point_x, point_y)
+    if len(index):
+        output_geometries[is_multipoint] = shapely.multipoints(coords, indices=index)
+    
+    def numeric_values(column: str, mask: np.ndarray) -> np.ndarray:
+        values = np.full(len(filtered), np.nan)
+        if column in filtered.columns:
+            values[mask] = pd.to_numeric(filtered[column], errors='coerce').to_numpy(dtype=float)[mask]
+        return values
+    
+    def text_values(column: str, mask: np.ndarray) -> np.ndarray:
+        values = np.full(len(filtered), None, dtype=object)
+        if column in filtered.columns:
+            mask = mask & filtered[column].notna().to_numpy()
+            values[mask] = filtered[column].astype(str).to_numpy()[mask]
+        return values
+    
+    # Polygons and lines record the geometry they were reduced from, points
+    # and multipoints their own; every column has one type across chunks
+    type_names = pd.Series(type_ids).map(GEOMETRY_TYPE_NAMES).to_numpy(dtype=object)
+    is_reduced = is_polygon | is_line
+    table = pd.DataFrame({
+        "water_type": water_types,
+        "name": names,
+        "id": ids,
+        "original_geometry_type": np.where(is_reduced, type_names, None),
+        "area_sq_meters": numeric_values('SHAPE_Area', is_polygon),
+        "perimeter_meters": numeric_values('SHAPE_Length', is_polygon),
+        "length_meters": numeric_values('SHAPE_Length', is_line),
+        "hierarchy": text_values('HIERARCHY', is_line),
+        "perenniality": text_values('PERENNIALITY', is_line),
+        "geometry_type": np.where(is_reduced, None, type_names),
+    })
+    
+    # Skip missing and unsupported geometries
+    keep = np.isin(type_ids, list(GEOMETRY_TYPE_NAMES))
+    return gpd.GeoDataFrame(table[keep].reset_index(drop=True),
+                            geometry=output_geometries[keep], crs='EPSG:4326')
+
+def table_to_features(table: gpd.GeoDataFrame) -> List[Dict[str, Any]]:
+    """GeoJSON feature dicts for the rows of a water_feature_table."""
     water_features = []
     
-    for idx, row in gdf.iterrows():
-        # Check if this feature is water-related
-        is_water, water_type = is_water_feature(row, water_keywords)
+    def column_values(column: str) -> List[Any]:
+        values = table[column]
+        return values.astype(object).where(values.notna(), None).tolist()
+    
+    water_types = table['water_type'].tolist()
+    names = table['name'].tolist()
+    ids = table['id'].tolist()
+    original_types = column_values('original_geometry_type')
+    geometry_types = column_values('geometry_type')
+    areas = column_values('area_sq_meters')
+    perimeters = column_values('perimeter_meters')
+    lengths = column_values('length_meters')
+    hierarchies = column_values('hierarchy')
+    perennialities = column_values('perenniality')
+    
+    # Plain Python floats for the per-feature loop; multipoints get their
+    # coordinate arrays, everything else is a single point
+    geometries = table.geometry.to_numpy()
+    point_x = shapely.get_x(geometries).tolist()
+    point_y = shapely.get_y(geometries).tolist()
+    is_multipoint = shapely.get_type_id(geometries) == MULTIPOINT_TYPE_ID
+    multipoint_coords = {}
+    if is_multipoint.any():
+        coords, index = shapely.get_coordinates(geometries[is_multipoint], return_index=True)
+        counts = np.bincount(index, minlength=int(is_multipoint.sum()))
+        multipoint_coords = dict(zip(np.flatnonzero(is_multipoint).tolist(),
+                                     np.split(coords, np.cumsum(counts)[:-1])))
+    
+    for i in range(len(table)):
+        properties = {
+            "water_type": water_types[i],
+            "name": names[i],
+            "id": ids[i],
+        }
         
-        if is_water:
-            # Extract basic information
-            feature_name = get_feature_name(row)
-            feature_id = get_feature_id(row, idx)
-            
-            # Convert geometry to GeoJSON
-            try:
-                if hasattr(row.geometry, '__geo_interface__'):
-                    geometry = row.geometry.__geo_interface__
-                    
-                    # For distance calculations, convert polygons to centroids (point)
-                    if geometry.get('type') in ['Polygon', 'MultiPolygon']:
-                        # Get centroid for distance calculations
-                        centroid = row.geometry.centroid
-                        centroid_geom = centroid.__geo_interface__
-                        
-                        feature = {
-                            "type": "Feature",
-                            "properties": {
-                                "water_type": water_type,
-                                "name": feature_name,
-                                "id": feature_id,
-                                "original_geometry_type": geometry.get('type'),
-                                "area_sq_meters": getattr(row, 'SHAPE_Area', None),
-                                "perimeter_meters": getattr(row, 'SHAPE_Length', None)
-                            },
-                            "geometry": centroid_geom  # Use centroid for distance calc
-                        }
-                        water_features.append(feature)
-                        
-                    # For lines (rivers, streams), use centroid for distance calculation
-                    elif geometry.get('type') in ['LineString', 'MultiLineString']:
-                        # Get centroid for distance calculations
-                        centroid = row.geometry.centroid
-                        centroid_geom = centroid.__geo_interface__
-                        
-                        feature = {
-                            "type": "Feature",
-                            "properties": {
-                                "water_type": water_type,
-                                "name": feature_name,
-                                "id": feature_id,
-                                "original_geometry_type": geometry.get('type'),
-                                "length_meters": getattr(row, 'SHAPE_Length', None),
-                                "hierarchy": getattr(row, 'HIERARCHY', None),
-                                "perenniality": getattr(row, 'PERENNIALITY', None)
-                            },
-                            "geometry": centroid_geom  # Use centroid for distance calc
-                        }
-                        water_features.append(feature)
-                        
-                    elif geometry.get('type') in ['Point', 'MultiPoint']:
-                        feature = {
-                            "type": "Feature",
-                            "properties": {
-                                "water_type": water_type,
-                                "name": feature_name,
-                                "id": feature_id,
-                                "geometry_type": geometry.get('type')
-                            },
-                            "geometry": geometry
-                        }
-                        water_features.append(feature)
-                        
-                else:
-                    continue  # Skip invalid geometries
-                    
-            except Exception as e:
-                continue  # Skip problematic features
+        # For distance calculations, polygons and lines were reduced to a point
+        if original_types[i] in ('Polygon', 'MultiPolygon'):
+            properties["original_geometry_type"] = original_types[i]
+            properties["area_sq_meters"] = areas[i]
+            properties["perimeter_meters"] = perimeters[i]
+        
+        elif original_types[i] is not None:
+            properties["original_geometry_type"] = original_types[i]
+            properties["length_meters"] = lengths[i]
+            properties["hierarchy"] = hierarchies[i]
+            properties["perenniality"] = perennialities[i]
+        
+        else:
+            properties["geometry_type"] = geometry_types[i]
+        
+        if i in multipoint_coords:
+            geometry = {"type": "MultiPoint", "coordinates": multipoint_coords[i].tolist()}
+        else:
+            geometry = {"type": "Point", "coordinates": [point_x[i], point_y[i]]}
+        
+        water_features.append({
+            "type": "Feature",
+            "properties": properties,
+            "geometry": geometry
+        })
     
     return water_features
 
-def is_water_feature(row: pd.Series, water_keywords: List[str]) -> tuple[bool, str]:
+def filter_water_features(gdf: gpd.GeoDataFrame, water_keywords: List[str],
+                          transformer: Optional['Transformer'] = None) -> List[Dict[str, Any]]:
+    """Filter a GeoDataFrame for water-related features as GeoJSON feature dicts."""
+    return table_to_features(water_feature_table(gdf, water_keywords, transformer))
+
+def vertex_means(geometries: np.ndarray) -> tuple:
+    """Mean vertex x/y of each geometry (NaN for empty geometries)."""
+    coords, index = shapely.get_coordinates(geometries, return_index=True)
+    counts = np.bincount(index, minlength=len(geometries))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_x = np.bincount(index, weights=coords[:, 0], minlength=len(geometries)) / counts
+        mean_y = np.bincount(index, weights=coords[:, 1], minlength=len(geometries)) / counts
+    return mean_x, mean_y
+
+def classify_water_features(gdf: gpd.GeoDataFrame, water_keywords: List[str]) -> tuple:
     """
-    Determine if a feature represents a water body based on its properties.
+    Classify every row as water or not: returns (is_water mask, water_type array).
+    
+    A FEATURETYPE in WATER_FEATURETYPES wins; otherwise the first text column
+    (in column order) containing a water keyword gives the water type.
     """
+    is_water = np.zeros(len(gdf), dtype=bool)
+    water_types = np.full(len(gdf), "unknown", dtype=object)
+    
     # First check FEATURETYPE column specifically (for polygons/lines data)
-    if 'FEATURETYPE' in row:
-        featuretype = str(row['FEATURETYPE']).strip()
-        if featuretype in ['Lake', 'Swamp', 'Reservoir Area', 'Dam', 'Waterhole', 'Wetland', 'Watercourse']:
-            return True, featuretype
-    
-    # Then check all property values for water-related keywords
-    for prop_name, prop_value in row.items():
-        if prop_name == 'geometry':
-            continue
-            
-        if pd.isna(prop_value):
-            continue
-            
-        prop_str = str(prop_value).lower()
-        
-        # Check if any water keyword is in the property value
-        for keyword in water_keywords:
-            if keyword in prop_str:
-                return True, str(prop_value)
-    
-    return False, "unknown"
-
-def get_feature_name(row: pd.Series) -> str:
-    """Extract name from feature properties."""
-    name_fields = ['name', 'Name', 'NAME', 'feature_name', 'FEATURE_NAME', 'FEATNAME', 'TEXT_']
-    for field in name_fields:
-        if field in row and pd.notna(row[field]):
-            return str(row[field])
-    return "Unnamed Water Body"
-
-def get_feature_id(row: pd.Series, fallback_idx: int) -> Any:
-    """Extract ID from feature properties."""
-    id_fields = ['id', 'ID', 'objectid', 'OBJECTID', 'fid', 'FID', 'HYDRO_ID']
-    for field in id_fields:
-        if field in row and pd.notna(row[field]):
-            return row[field]
-    return fallback_idx
-
-def save_water_points(water_features: List[Dict[str, Any]], output_file: str):
-    """Save extracted water points to GeoJSON file."""
-    output_data = {
-        "type": "FeatureCollection",
-        "features": water_features,
-        "metadata": {
-            "description": "Water body points extracted for data centre site analysis",
-            "extraction_date": "2025-08-30",
-            "purpose": "Distance calculation for data centre cooling water access",
-            "total_features": len(water_features)
-        }
-    }
+    if 'FEATURETYPE' in gdf.columns:
+        featuretype = gdf['FEATURETYPE'].astype(str).str.strip()
+        matched = featuretype.isin(WATER_FEATURETYPES).to_numpy()
+        water_types[matched] = featuretype.to_numpy()[matched]
+        is_water |= matched
+    
+    # Then check property values for water-related keywords, one scan per column;
+    # the first matching column (in column order) gives the water type.
+    # Text columns repeat a small set of values, so each column is factorized
+    # (a C hash pass) and the regex only runs once per distinct value
+    keyword_re = keyword_pattern(tuple(water_keywords))
+    string_columns = gdf.select_dtypes(include=['object', 'string']).columns.drop(
+        gdf.geometry.name, errors='ignore')
+    
+    for column in string_columns:
+        if is_water.all():
+            break
+        codes, uniques = pd.factorize(gdf[column])  # nulls get code -1
+        unique_strings = np.array([str(value) for value in uniques], dtype=object)
+        unique_matched = np.array([keyword_re.search(value) is not None for value in unique_strings],
+                                  dtype=bool)
+        matched = (codes >= 0) & ~is_water
+        matched[matched] = unique_matched[codes[matched]]
+        water_types[matched] = unique_strings[codes[matched]]
+        is_water |= matched
+    
+    return is_water, water_types
+
+@lru_cache(maxsize=None)
+def keyword_pattern(water_keywords: tuple) -> re.Pattern:
+    """Compile the keywords into one case-insensitive alternation (once per keyword set)."""
+    return re.compile("|".join(map(re.escape, water_keywords)), re.IGNORECASE)
+
+def first_valid_values(gdf: gpd.GeoDataFrame, fields: tuple, fallback: Any) -> List[Any]:
+    """
+    Per row, the value of the first listed column that is present and not
+    null, else the fallback (a scalar or a per-row list), as text. Used for
+    the feature names (NAME_FIELDS) and ids (ID_FIELDS); ids mix text ids with
+    integer feature ids, so both come out as strings.
+    """
+    if isinstance(fallback, list):
+        values = np.empty(len(gdf), dtype=object)
+        values[:] = fallback
+    else:
+        values = np.full(len(gdf), fallback, dtype=object)
+    resolved = np.zeros(len(gdf), dtype=bool)
+    
+    for field in [f for f in fields if f in gdf.columns]:
+        column = gdf[field]
+        take = column.notna().to_numpy() & ~resolved
+        if take.any():
+            column_values = np.empty(len(gdf), dtype=object)
+            column_values[:] = column.tolist()
+            values[take] = column_values[take]
+            resolved |= take
+    
+    return [str(value) for value in values.tolist()]
+
+def json_dumps(obj: Any) -> bytes:
+    """Serialize to compact JSON bytes, using orjson when available."""
+    if HAS_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+def save_water_points(water_features: Iterable[Dict[str, Any]], output_file: str) -> int:
+    """
+    Save extracted water points to GeoJSON file.
+    
+    water_features may be any iterable (e.g. a generator fed straight from the
+    extraction), since the metadata with the feature count goes after the
+    features. Returns the number of features written.
+    """
+    total_features = 0
     
     try:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(output_data, f, separators=(',', ':'))  # Compact format
+        # Write the FeatureCollection wrapper by hand and encode one feature at
+        # a time, so the whole document is never built as a single string
+        with open(output_file, 'wb') as f:
+            f.write(b'{"type":"FeatureCollection","features":[')
+            for feature in water_features:
+                if total_features:
+                    f.write(b',')
+                f.write(json_dumps(feature))
+                total_features += 1
+            
+            metadata = {
+                "description": "Water body points extracted for data centre site analysis",
+                "extraction_date": "2025-08-30",
+                "purpose": "Distance calculation for data centre cooling water access",
+                "total_features": total_features
+            }
+            f.write(b'],"metadata":')
+            f.write(json_dumps(metadata))
+            f.write(b'}')
         
         file_size = os.path.getsize(output_file) / 1024 / 1024
         print(f"\n✅ Successfully created {output_file}")
-        print(f"📊 Contains {len(water_features):,} water body points")
+        print(f"📊 Contains {total_features:,} water body points")
         print(f"📁 File size: {file_size:.2f} MB")
         
     except Exception as e:
         print(f"❌ Error writing output file: {e}")
+    
+    return total_features
+
+def save_water_points_table(tables: Iterable[gpd.GeoDataFrame], output_file: str) -> int:
+    """
+    Save extracted water points to GeoParquet (.parquet) or GeoPackage (.gpkg).
+    
+    tables are the per-chunk water_feature_table frames. GeoPackage chunks are
+    appended to the layer as they arrive; GeoParquet needs the schema of the
+    whole file up front, so its (point-only) chunks are concatenated and
+    written once. Returns the number of features written; write errors are
+    left to the caller.
+    """
+    total_features = 0
+    
+    if TABLE_FORMATS[os.path.splitext(output_file)[1].lower()] == 'Parquet':
+        frames = [table for table in tables if len(table)]
+        if frames:
+            gdf_out = pd.concat(frames, ignore_index=True)
+            gdf_out.to_parquet(output_file)
+            total_features = len(gdf_out)
+    else:
+        for table in tables:
+            if not len(table):
+                continue
+            pyogrio.write_dataframe(table, output_file, layer='water_points', driver='GPKG',
+                                    append=total_features > 0)
+            total_features += len(table)
+    
+    if total_features:
+        file_size = os.path.getsize(output_file) / 1024 / 1024
+        print(f"\n✅ Successfully created {output_file}")
+        print(f"📊 Contains {total_features:,} water body points")
+        print(f"📁 File size: {file_size:.2f} MB")
+    
+    return total_features
 
 def main():
     parser = argparse.ArgumentParser(description='Extract water body points from SurfaceHydrology GDB files')
@@ -285,11 +652,17 @@ def main():
                        help='Input GDB file (default: Points file)')
     parser.add_argument('--output', '-o', 
                        default='water_points_for_datacenter.geojson',
-                       help='Output GeoJSON file')
+                       help='Output file: .geojson, or .parquet / .gpkg for GeoParquet / GeoPackage')
     parser.add_argument('--chunk-size', type=int, default=5000,
                        help='Chunk size for processing (default: 5000)')
     parser.add_argument('--inspect', action='store_true',
                        help='Just inspect the GDB file structure without processing')
+    parser.add_argument('--workers', type=int, default=None,
+                       help='Worker threads for chunk processing (default: CPU count)')
+    parser.add_argument('--sites', default=None,
+                       help='GeoJSON of candidate data centre sites; only water bodies near them are read')
+    parser.add_argument('--site-margin', type=float, default=SITE_MARGIN_DEGREES,
+                       help=f'Margin around the sites in degrees (default: {SITE_MARGIN_DEGREES})')
     
     args = parser.parse_args()
     
@@ -318,32 +691,67 @@ def main():
         print("❌ No layers found in GDB file")
         return
     
+    bbox = None
+    if args.sites:
+        try:
+            bbox = load_sites_bbox(args.sites, args.site_margin)
+        except Exception as e:
+            print(f"❌ Error reading sites file {args.sites}: {e}")
+            return
+        print(f"📍 Sites: {args.sites} (±{args.site_margin}°)")
+    
     # Use the first (and usually only) layer
     layer_name = layers[0]
     print(f"\n🎯 Processing layer: {layer_name}")
     
-    # Extract water points
-    water_features = extract_water_points_chunked(args.input, layer_name, args.chunk_size)
+    # Extract water points, writing each chunk's features as soon as it is done
+    # and keeping only the first few (name, water type, geometry type) for the summary
+    sample_features = []
+    as_tables = os.path.splitext(args.output)[1].lower() in TABLE_FORMATS
     
-    if water_features:
-        # Save results
-        save_water_points(water_features, args.output)
-        
+    def stream_batches():
+        for chunk in iter_water_feature_batches(args.input, layer_name, args.chunk_size,
+                                                workers=args.workers, bbox=bbox, as_tables=as_tables):
+            if as_tables and len(chunk):
+                rows = chunk.head(5 - len(sample_features))
+                sample_features.extend(zip(rows['name'], rows['water_type'],
+                                           rows['geometry_type'].fillna('unknown')))
+            elif not as_tables:
+                sample_features.extend(
+                    (feature['properties'].get('name', 'Unnamed'),
+                     feature['properties'].get('water_type', 'unknown'),
+                     feature['properties'].get('geometry_type', 'unknown'))
+                    for feature in chunk[:5 - len(sample_features)])
+            yield chunk
+    
+    if as_tables:
+        try:
+            total_features = save_water_points_table(stream_batches(), args.output)
+        except Exception as e:
+            # Leave whatever was written in place: this is a failed write, not
+            # an empty extraction
+            print(f"❌ Error writing output file: {e}")
+            sys.exit(1)
+    else:
+        total_features = save_water_points(
+            (feature for batch in stream_batches() for feature in batch), args.output)
+    
+    if total_features:
         # Show sample results
         print(f"\n📋 Sample water bodies found:")
-        for i, feature in enumerate(water_features[:5]):
-            name = feature['properties'].get('name', 'Unnamed')
-            water_type = feature['properties'].get('water_type', 'unknown')
-            geom_type = feature['properties'].get('geometry_type', 'unknown')
+        for i, (name, water_type, geom_type) in enumerate(sample_features):
             print(f"  {i+1}. {name} ({water_type}) [{geom_type}]")
         
-        if len(water_features) > 5:
-            print(f"  ... and {len(water_features) - 5:,} more")
+        if total_features > 5:
+            print(f"  ... and {total_features - 5:,} more")
         
         print(f"\n🎯 Next step: Use this file to calculate distances to your data centre location!")
         print(f"💡 Tip: For larger coverage, you can also process the Polygons file (lakes, etc.)")
         
     else:
+        # Don't leave an empty collection behind
+        if os.path.exists(args.output):
+            os.remove(args.output)
         print("\n❌ No water features found.")
         print("💡 This might mean:")
         print("   - The layer doesn't contain water body data")
@@ -3,7 +3,28 @@ import json
 import time
 from pathlib import Path
 
-def download_arcgis_geojson(base_url, output_filename, layer_id=0, chunk_size=1000):
+# One pooled session for every request, so the paged queries reuse the same
+# TCP/TLS connection instead of reconnecting per page
+session = requests.Session()
+
+COUNT_PARAMS = {'where': '1=1', 'returnCountOnly': 'true', 'f': 'json'}
+
+def fetch_json(url, params=None):
+    """
+    GET a URL through the shared session and return the decoded JSON body
+    """
+    response = session.get(url, params=params)
+    response.raise_for_status()
+    return response.json()
+
+def get_feature_count(query_url):
+    """
+    Number of features behind a layer query URL (None if the server doesn't say)
+    """
+    return fetch_json(query_url, params=COUNT_PARAMS).get('count')
+
+def download_arcgis_geojson(base_url, output_filename, layer_id=0, chunk_size=1000,
+                            output_format='geojson'):
     """
     Download data from ArcGIS FeatureServer as GeoJSON
     
@@ -12,6 +33,8 @@ def download_arcgis_geojson(base_url, output_filename, layer_id=0, chunk_size=10
         output_filename: Name for output GeoJSON file
         layer_id: Layer ID to download (usually 0)
         chunk_size: Number of features to request at once
+        output_format: 'geojson' for a FeatureCollection or 'geojsonl' to stream
+            one feature per line (GeoJSONSeq) as each chunk arrives
     """
     
     # Construct the query URL for the specific layer
@@ -20,17 +43,8 @@ def download_arcgis_geojson(base_url, output_filename, layer_id=0, chunk_size=10
     print(f"Downloading from: {query_url}")
     
     # First, get the total count of features
-    count_params = {
-        'where': '1=1',
-        'returnCountOnly': 'true',
-        'f': 'json'
-    }
-    
     try:
-        response = requests.get(query_url, params=count_params)
-        response.raise_for_status()
-        count_data = response.json()
-        total_features = count_data.get('count', 0)
+        total_features = get_feature_count(query_url) or 0
         print(f"Total features to download: {total_features}")
         
         if total_features == 0:
@@ -46,6 +60,17 @@ def download_arcgis_geojson(base_url, output_filename, layer_id=0, chunk_size=10
     all_features = []
     offset = 0
     
+    # For newline-delimited output, write each chunk as it arrives instead of
+    # holding every feature in memory until the end
+    stream_file = None
+    if output_format == 'geojsonl':
+        try:
+            stream_file = open(output_filename, 'w', encoding='utf-8')
+        except Exception as e:
+            print(f"Error saving file: {e}")
+            return False
+    total_downloaded = 0
+    
     while True:
         # Parameters for each request
         params = {
@@ -58,11 +83,8 @@ def download_arcgis_geojson(base_url, output_filename, layer_id=0, chunk_size=10
         
         try:
             print(f"Downloading features {offset} to {offset + chunk_size}...")
-            response = requests.get(query_url, params=params)
-            response.raise_for_status()
-            
             # Parse the GeoJSON response
-            geojson_data = response.json()
+            geojson_data = fetch_json(query_url, params=params)
             
             # Check if we got features
             features = geojson_data.get('features', [])
@@ -72,9 +94,15 @@ def download_arcgis_geojson(base_url, output_filename, layer_id=0, chunk_size=10
                 break
                 
             # Add features to our collection
-            all_features.extend(features)
+            if stream_file is not None:
+                for feature in features:
+                    stream_file.write(json.dumps(feature, ensure_ascii=False, separators=(',', ':')))
+                    stream_file.write('\n')
+            else:
+                all_features.extend(features)
+            total_downloaded += len(features)
             
-            print(f"Downloaded {len(features)} features (total: {len(all_features)})")
+            print(f"Downloaded {len(features)} features (total: {total_downloaded})")
             
             # If we got fewer features than requested, we've reached the end
             if len(features) < chunk_size:
@@ -90,6 +118,11 @@ def download_arcgis_geojson(base_url, output_filename, layer_id=0, chunk_size=10
             print(f"Error downloading chunk at offset {offset}: {e}")
             break
     
+    if stream_file is not None:
+        stream_file.close()
+        print(f"\n✅ Successfully saved {total_downloaded} features to '{output_filename}'")
+        return True
+    
     # Create final GeoJSON structure
     final_geojson = {
         "type": "FeatureCollection",
@@ -113,9 +146,7 @@ def get_layer_info(base_url):
     Get information about available layers in the FeatureServer
     """
     try:
-        response = requests.get(f"{base_url}?f=json")
-        response.raise_for_status()
-        service_info = response.json()
+        service_info = fetch_json(base_url, params={'f': 'json'})
         
         print("📋 Available Layers:")
         print("-" * 50)
@@ -135,11 +166,9 @@ def get_layer_info(base_url):
             
             # Get feature count for this layer
             try:
-                count_url = f"{base_url}/{layer_id}/query"
-                count_params = {'where': '1=1', 'returnCountOnly': 'true', 'f': 'json'}
-                count_response = requests.get(count_url, params=count_params)
-                count_data = count_response.json()
-                feature_count = count_data.get('count', 'Unknown')
+                feature_count = get_feature_count(f"{base_url}/{layer_id}/query")
+                if feature_count is None:
+                    feature_count = 'Unknown'
                 print(f"  Features: {feature_count}")
             except:
                 print(f"  Features: Unable to determine")
@@ -208,10 +237,7 @@ def simple_download(base_url, layer_id=0, output_filename="output.geojson"):
     
     try:
         print("Attempting simple download...")
-        response = requests.get(query_url, params=params)
-        response.raise_for_status()
-        
-        geojson_data = response.json()
+        geojson_data = fetch_json(query_url, params=params)
         
         with open(output_filename, 'w', encoding='utf-8') as f:
             json.dump(geojson_data, f, indent=2, ensure_ascii=False)
@@ -11,15 +11,20 @@ This script reduces the bushfire boundaries file size by:
 Target: Create a lightweight risk assessment dataset for site selection.
 """
 
+import gzip
 import json
 import os
 import sys
-from typing import List, Dict, Any, Optional
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
 import argparse
 
 try:
     import geopandas as gpd
     import pandas as pd
+    import numpy as np
+    import shapely
     from shapely.geometry import shape
     from shapely.ops import unary_union
     import shapely.wkt
@@ -30,24 +35,235 @@ except ImportError:
     print("Please install with: pip install geopandas")
     sys.exit(1)
 
-def simplify_geometry(geom_dict, tolerance=0.001):
-    """Simplify geometry to reduce file size while maintaining shape."""
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import ijson
+    HAS_IJSON = True
+except ImportError:
+    HAS_IJSON = False
+
+# RFC 7464 record separator that prefixes each GeoJSON text sequence record
+RECORD_SEPARATOR = b'\x1e'
+
+# GDA94 / Australian Albers: equal-area, in metres, used for buffering
+METRIC_CRS = 'EPSG:3577'
+
+RISK_PRIORITY = {'Very High': 4, 'High': 3, 'Medium': 2, 'Low': 1, '': 0}
+
+# Features are filtered in batches of this size while streaming the input
+FILTER_BATCH_SIZE = 10000
+# Below this many geometries a thread pool costs more than it saves
+PARALLEL_MIN_GEOMETRIES = 1000
+# Geometries with fewer coordinates than this are not simplified
+SIMPLIFY_MIN_COORDS = 20
+# Geometries per partial union in cascaded_union
+UNION_CHUNK_SIZE = 500
+POLYGON_TYPE_ID = 3  # shapely.get_type_id value for Polygon
+FILTERED_COLUMNS = ['id', 'area_ha', 'risk_level', 'risk_rank', 'fire_type', 'year', 'geometry']
+
+def json_loads(data: bytes) -> Any:
+    """Parse JSON bytes, using orjson when available."""
+    return orjson.loads(data) if HAS_ORJSON else json.loads(data)
+
+def json_dumps(obj: Any) -> bytes:
+    """Serialize to compact JSON bytes, using orjson when available."""
+    if HAS_ORJSON:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+def open_geojson(path: str, mode: str = 'rb'):
+    """Open a GeoJSON file in binary mode, transparently gzipped for .gz paths."""
+    if path.endswith('.gz'):
+        return gzip.open(path, mode, compresslevel=6)
+    return open(path, mode)
+
+def load_geojson(path: str) -> Dict[str, Any]:
+    """Load a GeoJSON file."""
+    with open_geojson(path) as f:
+        return json_loads(f.read())
+
+def iter_geojson_features(path: str):
+    """Yield features one at a time, streaming with ijson when available.
+    
+    Also reads GeoJSON text sequences written by write_geojson_seq.
+    """
+    with open_geojson(path) as f:
+        if f.read(1) == RECORD_SEPARATOR:
+            f.seek(0)
+            for line in f:
+                line = line.strip(RECORD_SEPARATOR + b' \r\n')
+                if line:
+                    record = json_loads(line)
+                    if record.get('type') == 'Feature':
+                        yield record
+            return
+    
+    if HAS_IJSON:
+        with open_geojson(path) as f:
+            yield from ijson.items(f, 'features.item', use_float=True)
+    else:
+        yield from load_geojson(path).get('features', [])
+
+def encode_features(features: List[Dict[str, Any]]) -> List[bytes]:
+    """Serialize features whose geometries are shapely objects to JSON bytes.
+    
+    All geometries are encoded in one shapely.to_geojson call and spliced in
+    next to the small properties dict, so no geometry dicts are built.
+    """
+    geometries = np.empty(len(features), dtype=object)
+    geometries[:] = [feature['geometry'] for feature in features]
+    geometry_json = shapely.to_geojson(geometries)
+    
+    return [
+        b'{"type":"Feature","geometry":'
+        + (geom.encode('utf-8') if geom is not None else b'null')
+        + b',"properties":' + json_dumps(feature['properties']) + b'}'
+        for feature, geom in zip(features, geometry_json)
+    ]
+
+def write_geojson_seq(features: List[Dict[str, Any]], metadata: Dict[str, Any], path: str):
+    """Write a GeoJSON text sequence (RFC 7464): one RS-prefixed record per line.
+    
+    The metadata goes first as a {"type": "Metadata"} record, followed by
+    each feature, so consumers can stream the file record by record.
+    """
+    with open_geojson(path, 'wb') as f:
+        f.write(RECORD_SEPARATOR + json_dumps({"type": "Metadata", **metadata}) + b'\n')
+        for encoded in encode_features(features):
+            f.write(RECORD_SEPARATOR + encoded + b'\n')
+
+def write_geojson(features: List[Dict[str, Any]], metadata: Dict[str, Any], path: str):
+    """Write a compact GeoJSON FeatureCollection with a metadata member."""
+    with open_geojson(path, 'wb') as f:
+        f.write(b'{"type":"FeatureCollection","features":[')
+        f.write(b','.join(encode_features(features)))
+        f.write(b'],"metadata":' + json_dumps(metadata) + b'}')
+
+def parallel_geometry_op(func, geoms: np.ndarray, *args, **kwargs) -> np.ndarray:
+    """Apply a vectorized shapely function to slices of geoms on a thread pool.
+    
+    GEOS releases the GIL, so threads run in parallel without pickling geometries.
+    """
+    n_workers = os.cpu_count() or 1
+    if n_workers == 1 or len(geoms) < PARALLEL_MIN_GEOMETRIES:
+        return func(geoms, *args, **kwargs)
+    
+    chunks = np.array_split(geoms, n_workers)
+    with ThreadPoolExecutor(max_workers=n_workers) as executor:
+        results = list(executor.map(lambda chunk: func(chunk, *args, **kwargs), chunks))
+    return np.concatenate(results)
+
+def _area_value(value) -> float:
     try:
-        geom = shape(geom_dict)
-        simplified = geom.simplify(tolerance, preserve_topology=True)
-        
-        # Convert back to dict format for JSON serialization
-        if hasattr(simplified, '__geo_interface__'):
-            return simplified.__geo_interface__
-        else:
-            return geom_dict
-    except:
-        return geom_dict
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+def _outer_rings(geom_dict: Dict[str, Any]):
+    """Exterior-ring coordinates of every part of a GeoJSON Polygon or MultiPolygon dict."""
+    coords = geom_dict.get('coordinates')
+    if not coords:
+        return None
+    if geom_dict['type'] == 'MultiPolygon':
+        rings = [np.asarray(part[0], dtype=np.float64) for part in coords if part]
+        return np.concatenate(rings) if rings else None
+    return np.asarray(coords[0], dtype=np.float64)
+
+def in_bbox(geom_dict: Optional[Dict[str, Any]], bbox: Tuple[float, float, float, float]) -> bool:
+    """Cheap bounding-box overlap test on a GeoJSON polygon, without building a shape.
+    
+    The exterior rings of all polygon parts are inspected (holes can't extend
+    a polygon's bounds), which is enough to drop fires that lie entirely
+    outside the area of interest. Only Polygons and MultiPolygons are tested;
+    features with any other geometry type are kept.
+    """
+    if not geom_dict:
+        return False
+    if geom_dict.get('type') not in ('Polygon', 'MultiPolygon'):
+        return True
+    coords = _outer_rings(geom_dict)
+    if coords is None or not len(coords):
+        return False
+    min_x, min_y = coords[:, 0].min(), coords[:, 1].min()
+    max_x, max_y = coords[:, 0].max(), coords[:, 1].max()
+    return min_x <= bbox[2] and max_x >= bbox[0] and min_y <= bbox[3] and max_y >= bbox[1]
+
+def filter_significant_fires(features: List[Dict[str, Any]], min_area_ha: float,
+                             aoi_bbox: Optional[Tuple[float, float, float, float]] = None) -> gpd.GeoDataFrame:
+    """Filter a batch of fire features with vectorized masks, returning the kept rows.
+    
+    Only the fields the filter needs are pulled into contiguous arrays
+    (area as float64, risk level as an int8 rank); rows are materialized
+    just for the features that survive. If aoi_bbox (minx, miny, maxx, maxy)
+    is given, fires outside it are dropped as well.
+    """
+    props = [feature['properties'] for feature in features]
+    area_ha = np.fromiter((_area_value(p.get('area_ha', 0)) for p in props),
+                          dtype=np.float64, count=len(props))
+    # Integer rank computed once per feature so filtering and sorting never
+    # compare strings
+    risk_rank = np.fromiter((RISK_PRIORITY.get(p.get('risk_level') or '', 0) for p in props),
+                            dtype=np.int8, count=len(props))
+    
+    # Keep if:
+    # 1. Large enough to be significant for infrastructure planning
+    # 2. High or Very High risk regardless of size
+    # 3. Medium risk fires if they're reasonably sized
+    keep = (
+        (area_ha >= min_area_ha)
+        | (risk_rank >= RISK_PRIORITY['High'])
+        | ((risk_rank == RISK_PRIORITY['Medium']) & (area_ha >= 50))
+    )
+    kept_idx = np.flatnonzero(keep)
+    if aoi_bbox is not None:
+        # Drop fires outside the area of interest before any shape() is built
+        kept_idx = np.array([i for i in kept_idx if in_bbox(features[i]['geometry'], aoi_bbox)],
+                            dtype=np.intp)
+    kept_props = [props[i] for i in kept_idx]
+    
+    # Extract year from capture_date for temporal relevance
+    capture_year = pd.Series([p.get('capture_date') for p in kept_props], dtype='string').str.slice(0, 4)
+    
+    kept = pd.DataFrame({
+        'id': [p.get('id', '') for p in kept_props],
+        'area_ha': area_ha[kept_idx],
+        'risk_level': [p.get('risk_level', '') for p in kept_props],
+        'risk_rank': risk_rank[kept_idx],
+        'fire_type': [p.get('fire_type', '') for p in kept_props],
+        'year': pd.to_numeric(capture_year, errors='coerce').astype('Int16'),
+    })
+    geometries = [features[i]['geometry'] for i in kept_idx]
+    kept['geometry'] = [shape(geom) if geom else None for geom in geometries]
+    return gpd.GeoDataFrame(kept, geometry='geometry', crs='EPSG:4326')
+
+def top_rows(key: np.ndarray, k: int) -> np.ndarray:
+    """Positions (ascending) of the k largest keys, found by partial selection.
+    
+    Ties at the cut keep the earliest rows, so the result is the same set a
+    stable descending sort would put first.
+    """
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    if len(key) <= k:
+        return np.arange(len(key))
+    cut = len(key) - k
+    kth = np.partition(key, cut)[cut]
+    above = np.flatnonzero(key > kth)
+    ties = np.flatnonzero(key == kth)[:k - len(above)]
+    return np.sort(np.concatenate([above, ties]))
 
 def optimize_bushfire_data(input_file: str, output_file: str, 
                           min_area_ha: float = 100.0,
                           max_features: int = 5000,
-                          simplify_tolerance: float = 0.001) -> bool:
+                          simplify_tolerance: float = 0.001,
+                          coord_precision: int = 5,
+                          ndjson: bool = False,
+                          aoi_bbox: Optional[Tuple[float, float, float, float]] = None) -> bool:
     """
     Optimize bushfire boundaries for data center site selection.
     
@@ -57,6 +273,10 @@ def optimize_bushfire_data(input_file: str, output_file: str,
         min_area_ha: Minimum fire area to include (hectares)
         max_features: Maximum features to keep
         simplify_tolerance: Geometry simplification tolerance
+        coord_precision: Decimal places kept in output coordinates
+        ndjson: Write a GeoJSON text sequence instead of a FeatureCollection
+        aoi_bbox: Optional (minx, miny, maxx, maxy) area of interest; fires
+            outside it are skipped
     """
     
     try:
@@ -66,130 +286,120 @@ def optimize_bushfire_data(input_file: str, output_file: str,
         print(f"   Min area: {min_area_ha} hectares")
         print(f"   Max features: {max_features}")
         print(f"   Simplification: {simplify_tolerance}")
+        print(f"   Coordinate precision: {coord_precision} decimals")
+        if aoi_bbox is not None:
+            print(f"   Area of interest: {aoi_bbox}")
         
-        # Load data
-        with open(input_file, 'r') as f:
-            data = json.load(f)
+        input_size_bytes = os.path.getsize(input_file)
         
-        features = data.get('features', [])
-        print(f"   Original features: {len(features):,}")
+        # Stream features and filter them in vectorized batches so rejected
+        # fires never pile up in memory; only the survivors are kept
+        kept_batches = []
+        batch = []
+        original_count = 0
         
-        # Filter for significant fires that affect infrastructure planning
-        filtered_features = []
+        for feature in iter_geojson_features(input_file):
+            batch.append(feature)
+            if len(batch) >= FILTER_BATCH_SIZE:
+                kept_batches.append(filter_significant_fires(batch, min_area_ha, aoi_bbox))
+                original_count += len(batch)
+                batch = []
+        if batch:
+            kept_batches.append(filter_significant_fires(batch, min_area_ha, aoi_bbox))
+            original_count += len(batch)
+        del batch
         
-        for feature in features:
-            props = feature['properties']
-            area_ha = props.get('area_ha', 0)
-            risk_level = props.get('risk_level', '')
-            
-            # Keep if:
-            # 1. Large enough to be significant for infrastructure planning
-            # 2. High or Very High risk regardless of size
-            # 3. Recent fires (more relevant for current planning)
-            
-            keep_feature = False
-            
-            # Large fires are always significant
-            if area_ha >= min_area_ha:
-                keep_feature = True
-            
-            # High risk fires regardless of size
-            if risk_level in ['High', 'Very High']:
-                keep_feature = True
-            
-            # Medium risk fires if they're reasonably sized
-            if risk_level == 'Medium' and area_ha >= 50:
-                keep_feature = True
-            
-            if keep_feature:
-                # Simplify geometry to reduce file size
-                simplified_geom = simplify_geometry(feature['geometry'], simplify_tolerance)
-                
-                # Keep only essential properties for site selection
-                optimized_feature = {
-                    "type": "Feature",
-                    "geometry": simplified_geom,
-                    "properties": {
-                        "id": props.get('id', ''),
-                        "area_ha": area_ha,
-                        "risk_level": risk_level,
-                        "fire_type": props.get('fire_type', ''),
-                        "year": None  # Extract year for temporal relevance
-                    }
-                }
-                
-                # Extract year from capture_date for temporal filtering
-                capture_date = props.get('capture_date', '')
-                if isinstance(capture_date, str) and len(capture_date) >= 4:
-                    try:
-                        year = int(capture_date[:4])
-                        optimized_feature['properties']['year'] = year
-                    except:
-                        pass
-                
-                filtered_features.append(optimized_feature)
+        if kept_batches:
+            filtered = pd.concat(kept_batches, ignore_index=True)
+        else:
+            filtered = gpd.GeoDataFrame(columns=FILTERED_COLUMNS, geometry='geometry', crs='EPSG:4326')
+        del kept_batches
         
-        print(f"   Filtered features: {len(filtered_features):,}")
+        print(f"   Original features: {original_count:,}")
+        print(f"   Filtered features: {len(filtered):,}")
+        
+        # Keep only the most significant features: partially select the top
+        # max_features by (risk level, area) so only those need a full sort
+        if len(filtered) > max_features:
+            # Areas are far below 1e12 ha, so this key orders by rank then area
+            key = filtered['risk_rank'].to_numpy() * 1e12 + filtered['area_ha'].to_numpy()
+            filtered = filtered.iloc[top_rows(key, max_features)]
+            print(f"   Reduced to top {max_features} most significant fires")
         
         # Sort by risk level and area (most important first)
-        risk_priority = {'Very High': 4, 'High': 3, 'Medium': 2, 'Low': 1, '': 0}
+        filtered = filtered.sort_values(['risk_rank', 'area_ha'], ascending=False, kind='stable')
         
-        filtered_features.sort(
-            key=lambda x: (
-                risk_priority.get(x['properties']['risk_level'], 0),
-                x['properties']['area_ha']
-            ), 
-            reverse=True
-        )
+        # Simplify geometry to reduce file size with vectorized GEOS calls.
+        # Small polygons gain little from it and are left as they are; the
+        # rest use plain Douglas-Peucker, repairing only results that came
+        # out invalid instead of paying for topology checks on every one
+        geoms = filtered.geometry.to_numpy()
+        simplified = geoms.copy()
+        large = shapely.get_num_coordinates(geoms) >= SIMPLIFY_MIN_COORDS
+        simplified[large] = parallel_geometry_op(shapely.simplify, geoms[large],
+                                                 simplify_tolerance, preserve_topology=False)
+        invalid = large & ~shapely.is_valid(simplified)
+        simplified[invalid] = shapely.make_valid(simplified[invalid])
+        # Snap coordinates to a grid so they serialize with fewer digits
+        simplified = parallel_geometry_op(shapely.set_precision, simplified,
+                                          10.0 ** -coord_precision, mode='keep_collapsed')
         
-        # Keep only the most significant features
-        if len(filtered_features) > max_features:
-            filtered_features = filtered_features[:max_features]
-            print(f"   Reduced to top {max_features} most significant fires")
+        # Keep only essential properties for site selection
+        filtered_features = [
+            {
+                "type": "Feature",
+                "geometry": geom,
+                "properties": {
+                    "id": row.id,
+                    "area_ha": row.area_ha,
+                    "risk_level": row.risk_level,
+                    "fire_type": row.fire_type,
+                    "year": None if pd.isna(row.year) else int(row.year)
+                }
+            }
+            for row, geom in zip(filtered.itertuples(index=False), simplified)
+        ]
+        # Release the dataframe before the union phase
+        del filtered, geoms, simplified
         
         # Create risk zones by combining overlapping fires of same risk level
         print(f"   Creating risk zones...")
         risk_zones = create_risk_zones(filtered_features)
         
-        # Create optimized GeoJSON
-        optimized_data = {
-            "type": "FeatureCollection",
-            "features": risk_zones,
-            "metadata": {
-                "source": "Optimized from bushfire_boundaries.geojson",
-                "purpose": "Data center site risk assessment",
-                "optimization_date": pd.Timestamp.now().isoformat(),
-                "total_original_features": len(features),
-                "total_optimized_features": len(risk_zones),
-                "min_area_filter": min_area_ha,
-                "simplification_tolerance": simplify_tolerance,
-                "notes": "Simplified geometries and properties for infrastructure planning"
-            }
+        metadata = {
+            "source": "Optimized from bushfire_boundaries.geojson",
+            "purpose": "Data center site risk assessment",
+            "optimization_date": pd.Timestamp.now().isoformat(),
+            "total_original_features": original_count,
+            "total_optimized_features": len(risk_zones),
+            "min_area_filter": min_area_ha,
+            "simplification_tolerance": simplify_tolerance,
+            "coordinate_precision": coord_precision,
+            "notes": "Simplified geometries and properties for infrastructure planning"
         }
         
         # Write optimized output
         os.makedirs(os.path.dirname(output_file), exist_ok=True)
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(optimized_data, f, separators=(',', ':'))  # Compact JSON
+        if ndjson:
+            write_geojson_seq(risk_zones, metadata, output_file)
+        else:
+            write_geojson(risk_zones, metadata, output_file)
         
         # Compare file sizes
-        original_size = os.path.getsize(input_file) / (1024 * 1024)
+        original_size = input_size_bytes / (1024 * 1024)
         optimized_size = os.path.getsize(output_file) / (1024 * 1024)
         reduction = (1 - optimized_size / original_size) * 100
         
         print(f"\n✅ Optimization complete:")
-        print(f"   Original: {original_size:.1f} MB ({len(features):,} features)")
+        print(f"   Original: {original_size:.1f} MB ({original_count:,} features)")
         print(f"   Optimized: {optimized_size:.1f} MB ({len(risk_zones):,} features)")
         print(f"   Size reduction: {reduction:.1f}%")
         
         # Show risk level distribution
-        risk_counts = {}
-        for feature in risk_zones:
-            risk = feature['properties']['risk_level']
-            risk_counts[risk] = risk_counts.get(risk, 0) + 1
+        risk_counts = Counter(feature['properties']['risk_level'] for feature in risk_zones)
         
         print(f"   Risk zone distribution:")
-        for risk, count in sorted(risk_counts.items(), key=lambda x: risk_priority.get(x[0], 0), reverse=True):
+        for risk, count in sorted(risk_counts.items(), key=lambda x: RISK_PRIORITY.get(x[0], 0), reverse=True):
             print(f"     {risk}: {count}")
         
         return True
@@ -200,6 +410,50 @@ def optimize_bushfire_data(input_file: str, output_file: str,
         traceback.print_exc()
         return False
 
+def cascaded_union(geoms: List[Any]):
+    """Union geometries in chunks, then union the partial results."""
+    partials = [shapely.unary_union(geoms[i:i + UNION_CHUNK_SIZE])
+                for i in range(0, len(geoms), UNION_CHUNK_SIZE)]
+    if len(partials) == 1:
+        return partials[0]
+    return shapely.unary_union(partials)
+
+def cluster_overlapping(geoms: np.ndarray) -> np.ndarray:
+    """Label groups of transitively intersecting geometries using an STRtree."""
+    tree = shapely.STRtree(geoms)
+    left, right = tree.query(geoms, predicate='intersects')
+    
+    # Connected components: propagate the smallest index across every
+    # intersecting pair, with pointer jumping, until the labels settle
+    labels = np.arange(len(geoms))
+    while True:
+        pair_min = np.minimum(labels[left], labels[right])
+        updated = labels.copy()
+        np.minimum.at(updated, left, pair_min)
+        np.minimum.at(updated, right, pair_min)
+        updated = updated[updated]
+        if np.array_equal(updated, labels):
+            return labels
+        labels = updated
+
+def dissolve_geometries(geoms):
+    """Union geometries, doing GEOS union work only inside overlapping clusters.
+    
+    Isolated geometries are passed through untouched and the disjoint
+    cluster results are assembled directly into one multi-geometry.
+    """
+    geoms = np.asarray(geoms, dtype=object)
+    labels = cluster_overlapping(geoms)
+    order = np.argsort(labels, kind='stable')
+    boundaries = np.flatnonzero(np.diff(labels[order])) + 1
+    clusters = np.split(geoms[order], boundaries)
+    merged = [cluster[0] if len(cluster) == 1 else cascaded_union(cluster) for cluster in clusters]
+    
+    parts = shapely.get_parts(merged)
+    if len(parts) and np.all(shapely.get_type_id(parts) == POLYGON_TYPE_ID):
+        return parts[0] if len(parts) == 1 else shapely.multipolygons(parts)
+    return shapely.unary_union(merged)
+
 def create_risk_zones(features):
     """Create consolidated risk zones from individual fire features."""
     risk_zones = []
@@ -224,15 +478,25 @@ def create_risk_zones(features):
                 if area_ha >= 1000:  # Keep large individual fires
                     risk_zones.append(feature)
         
-        # For Medium and Low risk, we could merge nearby fires
-        # But for simplicity, we'll keep the largest ones
+        # For Medium and Low risk, merge all fires into a single risk zone
         elif risk_level in ['Medium', 'Low']:
-            # Sort by area and keep top fires
-            sorted_features = sorted(group_features, key=lambda x: x['properties']['area_ha'], reverse=True)
+            geoms = [f['geometry'] for f in group_features if f['geometry'] is not None]
+            if not geoms:
+                continue
             
-            # Keep top fires for each risk level
-            max_keep = 200 if risk_level == 'Medium' else 100
-            risk_zones.extend(sorted_features[:max_keep])
+            zone_geom = dissolve_geometries(geoms)
+            risk_zones.append({
+                "type": "Feature",
+                "geometry": zone_geom,
+                "properties": {
+                    "id": f"{risk_level.lower()}_risk_zone",
+                    "area_ha": sum(f['properties']['area_ha'] for f in group_features),
+                    "risk_level": risk_level,
+                    "fire_type": "",
+                    "year": None,
+                    "fire_count": len(group_features)
+                }
+            })
     
     return risk_zones
 
@@ -259,10 +523,7 @@ def create_site_suitability_zones(input_file: str, output_file: str,
         print(f"\n🎯 Creating site suitability zones...")
         
         # Load optimized data
-        with open(input_file, 'r') as f:
-            data = json.load(f)
-        
-        features = data.get('features', [])
+        features = list(iter_geojson_features(input_file))
         
         # Create buffer zones for each risk level
         suitability_zones = []
@@ -275,53 +536,49 @@ def create_site_suitability_zones(input_file: str, output_file: str,
             
             print(f"   Processing {len(risk_features)} {risk_level} risk areas (buffer: {buffer_km}km)")
             
-            # Create buffer zones
-            for feature in risk_features:
-                try:
-                    geom = shape(feature['geometry'])
-                    # Buffer distance in degrees (approximate)
-                    buffer_degrees = buffer_km / 111.0  # Rough conversion
-                    buffered = geom.buffer(buffer_degrees)
-                    
-                    zone_feature = {
-                        "type": "Feature",
-                        "geometry": buffered.__geo_interface__,
-                        "properties": {
-                            "zone_type": f"{risk_level}_risk_buffer",
-                            "risk_level": risk_level,
-                            "buffer_km": buffer_km,
-                            "suitability": get_suitability_rating(risk_level),
-                            "original_fire_area_ha": feature['properties']['area_ha']
-                        }
-                    }
-                    
-                    suitability_zones.append(zone_feature)
-                    
-                except Exception as e:
-                    print(f"     Warning: Could not create buffer for feature: {e}")
-                    continue
+            # Dissolve the fires into one shape first, then buffer it once:
+            # the buffer of a union equals the union of buffers, without
+            # repeatedly buffering overlapping areas
+            geoms = [shape(f['geometry']) for f in risk_features if f['geometry']]
+            if not geoms:
+                print(f"     Warning: No geometries to buffer for {risk_level} risk areas")
+                continue
+            
+            # Buffer in true metres in an Australian equal-area projection
+            fires = gpd.GeoSeries(geoms, crs='EPSG:4326').to_crs(METRIC_CRS)
+            dissolved = dissolve_geometries(fires.to_numpy())
+            buffered = gpd.GeoSeries([shapely.buffer(dissolved, buffer_km * 1000)], crs=METRIC_CRS)
+            zone_geom = buffered.to_crs('EPSG:4326').iloc[0]
+            
+            suitability_zones.append({
+                "type": "Feature",
+                "geometry": zone_geom,
+                "properties": {
+                    "zone_type": f"{risk_level}_risk_buffer",
+                    "risk_level": risk_level,
+                    "buffer_km": buffer_km,
+                    "suitability": get_suitability_rating(risk_level),
+                    "fire_count": sum(f['properties'].get('fire_count', 1) for f in risk_features),
+                    "original_fire_area_ha": sum(f['properties']['area_ha'] for f in risk_features)
+                }
+            })
         
         # Create suitability GeoJSON
-        suitability_data = {
-            "type": "FeatureCollection",
-            "features": suitability_zones,
-            "metadata": {
-                "source": "Derived from optimized bushfire boundaries",
-                "purpose": "Data center site suitability assessment",
-                "creation_date": pd.Timestamp.now().isoformat(),
-                "buffer_distances_km": buffer_distances,
-                "suitability_ratings": {
-                    "Suitable": "Low risk areas with adequate buffers",
-                    "Caution": "Medium risk areas requiring assessment", 
-                    "High Risk": "High risk areas, avoid if possible",
-                    "Unsuitable": "Very high risk areas, not recommended"
-                }
+        metadata = {
+            "source": "Derived from optimized bushfire boundaries",
+            "purpose": "Data center site suitability assessment",
+            "creation_date": pd.Timestamp.now().isoformat(),
+            "buffer_distances_km": buffer_distances,
+            "suitability_ratings": {
+                "Suitable": "Low risk areas with adequate buffers",
+                "Caution": "Medium risk areas requiring assessment", 
+                "High Risk": "High risk areas, avoid if possible",
+                "Unsuitable": "Very high risk areas, not recommended"
             }
         }
         
         # Write output
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(suitability_data, f, separators=(',', ':'))
+        write_geojson(suitability_zones, metadata, output_file)
         
         file_size = os.path.getsize(output_file) / (1024 * 1024)
         print(f"   Created suitability zones: {output_file} ({file_size:.1f} MB)")
@@ -342,18 +599,31 @@ def get_suitability_rating(risk_level: str) -> str:
     }
     return ratings.get(risk_level, 'Unknown')
 
+def parse_bbox(value: str) -> Tuple[float, float, float, float]:
+    """Parse a 'minx,miny,maxx,maxy' command line value."""
+    parts = [float(part) for part in value.split(',')]
+    if len(parts) != 4:
+        raise argparse.ArgumentTypeError("expected minx,miny,maxx,maxy")
+    return tuple(parts)
+
 def main():
     parser = argparse.ArgumentParser(description='Optimize bushfire boundaries for data center site selection')
     parser.add_argument('--input', default='map_data/bushfire_boundaries.geojson',
                        help='Input bushfire boundaries file')
     parser.add_argument('--output', default='map_data/bushfire_risk_zones_optimized.geojson',
-                       help='Output optimized file')
+                       help='Output optimized file (gzip-compressed if it ends in .gz)')
     parser.add_argument('--min-area', type=float, default=100.0,
                        help='Minimum fire area in hectares')
     parser.add_argument('--max-features', type=int, default=3000,
                        help='Maximum features to keep')
     parser.add_argument('--simplify', type=float, default=0.002,
                        help='Geometry simplification tolerance')
+    parser.add_argument('--coord-precision', type=int, default=5,
+                       help='Decimal places kept in output coordinates')
+    parser.add_argument('--ndjson', action='store_true',
+                       help='Write a GeoJSON text sequence (RFC 7464) instead of a FeatureCollection')
+    parser.add_argument('--aoi-bbox', type=parse_bbox, default=None,
+                       help='Only keep fires overlapping this area of interest: minx,miny,maxx,maxy')
     parser.add_argument('--create-zones', action='store_true',
                        help='Also create site suitability zones')
     
@@ -369,7 +639,10 @@ def main():
         output_file=args.output,
         min_area_ha=args.min_area,
         max_features=args.max_features,
-        simplify_tolerance=args.simplify
+        simplify_tolerance=args.simplify,
+        coord_precision=args.coord_precision,
+        ndjson=args.ndjson,
+        aoi_bbox=args.aoi_bbox
     )
     
     if not success:
@@ -1,12 +1,18 @@
 import streamlit as st
+import streamlit.components.v1 as components
 import numpy as np
 import pandas as pd
 import pydeck as pdk
-from pydeck.bindings.base_map_provider import BaseMapProvider
-import json
-import matplotlib.pyplot as plt
-# Add these imports for tile server integration
-import requests
+import os
+from heatmap_utils import bin_heatmap_points
+# Fastest available JSON parser: orjson, then ujson, then the stdlib
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    try:
+        from ujson import loads as json_loads
+    except ImportError:
+        from json import loads as json_loads
 
 st.set_page_config(page_title="AI Data Centre Heatmap MVP", layout="wide")
 
@@ -14,6 +20,36 @@ st.title("🇦🇺 Data Centres: Heatmap MVP")
 
 mode = st.sidebar.selectbox("View", ["Dummy heatmap", "Power Stations", "GeoJSON Heatmaps"])
 
+
+# Parsed GeoJSON files are cached across reruns so a widget change doesn't
+# re-read and re-parse the file; mtime is part of the key so edits are picked up.
+# The parsed dict is shared rather than copied on every call (no pickling of a
+# large tree per rerun), so callers must treat it as read-only and derive
+# their own structures from it; unused files drop out after an hour
+@st.cache_resource(show_spinner=False, ttl="1h")
+def load_geojson(path, mtime):
+    with open(path, "rb") as f:
+        raw = f.read()
+    return json_loads(raw)
+
+
+# pydeck sends DataFrame layers to the browser as JSON records, so column
+# width on the wire is the length of each number's text. Values cast to
+# float32 and back through their shortest float32 repr keep float32 precision
+# (~7 significant digits) and serialize to about half as many characters
+def float32_payload(df):
+    return df.astype(np.float32).astype(str).astype(float)
+
+
+# Static mode embeds the deck as standalone HTML, so the browser renders it
+# directly instead of going through the pydeck component round-trip (no
+# Python-side selection events in that mode)
+def show_deck(deck, static=False, height=650):
+    if static:
+        components.html(deck.to_html(as_string=True), height=height)
+    else:
+        st.pydeck_chart(deck, use_container_width=True)
+
 # if mode == "ABS GPKG map":
 #     # Lazy-import geopandas to avoid heavy deps when not needed
 #     import geopandas as gpd
@@ -213,12 +249,32 @@ if mode == "Dummy heatmap":
     # --- Dummy heatmap mode (existing MVP) ---
     GRID_SIZE = 50
 
-    # Fake dataset A (population density-like pattern)
-    x, y = np.meshgrid(np.linspace(-10, 10, GRID_SIZE), np.linspace(-10, 10, GRID_SIZE))
-    grid1 = np.exp(-(x**2 + y**2) / 20) * 100
-
-    # Fake dataset B (renewable zones-like pattern)
-    grid2 = (np.sin(x) + np.cos(y)) * 50 + 50
+    # The fake datasets and coordinates never change, so they are built once and
+    # cached together (one cache lookup per rerun); a slider drag only
+    # recomputes the weighted sum below
+    @st.cache_data(show_spinner=False)
+    def make_dummy_data(size):
+        # Both patterns are separable in x and y, so they are built as outer
+        # products/sums of 1-D axes instead of from two full meshgrid arrays;
+        # the transcendentals only run on the `size` axis points
+        xs = np.linspace(-10, 10, size)
+        ys = xs
+        # Fake dataset A (population density-like pattern)
+        grid1 = np.outer(np.exp(-ys**2 / 20) * 100, np.exp(-xs**2 / 20))
+        # Fake dataset B (renewable zones-like pattern)
+        grid2 = np.add.outer(np.cos(ys) * 50 + 50, np.sin(xs) * 50)
+
+        # Flatten grid into a DataFrame for pydeck; row-major order of
+        # meshgrid(lats, lons) is lats tiled and lons repeated
+        lats = np.linspace(-35, -25, size)  # Example: lat band across Australia
+        lons = np.linspace(130, 140, size)  # Example: lon band across NT/SA
+        base_df = pd.DataFrame({
+            "lat": np.tile(lats, size),
+            "lon": np.repeat(lons, size),
+        })
+        return grid1.ravel(), grid2.ravel(), base_df
+
+    grid1, grid2, df = make_dummy_data(GRID_SIZE)
 
     # --- Step 2: Add sliders for weights ---
     st.sidebar.header("Adjust Weights")
@@ -226,22 +282,17 @@ if mode == "Dummy heatmap":
     w2 = st.sidebar.slider("Weight Dataset B (Energy)", 0.0, 1.0, 0.5, 0.01)
 
     # --- Step 3: Aggregate ---
-    heatmap = w1 * grid1 + w2 * grid2
-
-    # Flatten grid into a DataFrame for pydeck
-    lats = np.linspace(-35, -25, GRID_SIZE)  # Example: lat band across Australia
-    lons = np.linspace(130, 140, GRID_SIZE)  # Example: lon band across NT/SA
-    lat_grid, lon_grid = np.meshgrid(lats, lons)
-    df = pd.DataFrame({
-        "lat": lat_grid.flatten(),
-        "lon": lon_grid.flatten(),
-        "value": heatmap.flatten()
-    })
+    # st.cache_data hands back fresh copies, so the grids are scaled and summed
+    # in place (no temporaries)
+    grid1 *= w1
+    grid2 *= w2
+    grid1 += grid2
+    df["value"] = grid1
 
     # --- Step 4: Display heatmap ---
     layer = pdk.Layer(
         "HeatmapLayer",
-        data=df,
+        data=float32_payload(df),
         get_position=["lon", "lat"],
         get_weight="value",
         radiusPixels=40,
@@ -272,83 +323,91 @@ elif mode == "GeoJSON Heatmaps":
         geojson_path = "output/weighted_heatmap.geojson"
         st.write("Displaying Weighted Heatmap")
 
-    # Add controls for heatmap visualization
-    st.sidebar.header("Heatmap Settings")
-    radius_pixels = st.sidebar.slider("Radius (pixels)", 10, 100, 40)
-    intensity = st.sidebar.slider("Intensity", 0.1, 5.0, 1.0, 0.1)
-    threshold = st.sidebar.slider("Threshold", 0.01, 0.5, 0.01, 0.01)
-
-    # Color scheme selection
-    color_scheme = st.sidebar.selectbox(
-        "Color Scheme", 
-        ["Default", "Viridis", "Plasma", "Inferno", "Magma", "Cividis"]
-    )
-
     # Normalization option
     normalize = st.sidebar.checkbox("Normalize Values", value=False)
 
-    # Load the selected GeoJSON file
-    try:
-        with open(geojson_path, "r", encoding="utf-8") as f:
-            geojson_data = json.load(f)
+    fast_render = st.sidebar.checkbox("Fast render (static)", value=False)
+
+    # Convert GeoJSON features to DataFrame for pydeck; cached with the file
+    # parse, so the sliders below only re-render
+    @st.cache_data(show_spinner=False)
+    def load_heatmap_df(path, mtime):
+        geojson_data = load_geojson(path, mtime)
 
         # Extract features
         features = geojson_data.get("features", [])
-        st.write(f"Loaded {len(features)} data points from {geojson_path}")
-
-        # Convert GeoJSON features to DataFrame for pydeck
-        data_points = []
-        for feature in features:
-            props = feature.get("properties", {})
-            value = props.get("value")
-            # Handle null values
-            if value is None:
-                value = 0.0
-
-            # Get coordinates from geometry
-            coords = feature.get("geometry", {}).get("coordinates", [0, 0])
-            if len(coords) >= 2:
-                data_points.append({
-                    "lon": coords[0],
-                    "lat": coords[1],
-                    "value": float(value)
-                })
-
-        # Create DataFrame
-        df = pd.DataFrame(data_points)
-
-        # Normalize values if requested
-        if normalize and len(df) > 0:
-            min_val = df['value'].min()
-            max_val = df['value'].max()
-            if max_val > min_val:  # Avoid division by zero
-                df['normalized_value'] = (df['value'] - min_val) / (max_val - min_val)
-                weight_column = 'normalized_value'
-                st.info(f"Values normalized from range [{min_val:.2f}, {max_val:.2f}] to [0, 1]")
-            else:
-                weight_column = 'value'
-        else:
-            weight_column = 'value'
 
-        # Define color map based on selection
-        color_maps = {
-            "Default": [[255, 255, 178], [254, 217, 118], [254, 178, 76], [253, 141, 60], [240, 59, 32], [189, 0, 38]],
-            "Viridis": [[68, 1, 84], [72, 40, 120], [62, 83, 160], [49, 104, 142], [38, 130, 142], [31, 158, 137], [53, 183, 121], [109, 205, 89], [180, 222, 44], [253, 231, 37]],
-            "Plasma": [[13, 8, 135], [75, 3, 161], [125, 3, 168], [168, 34, 150], [203, 70, 121], [229, 107, 93], [248, 148, 65], [253, 195, 40], [240, 249, 33]],
-            "Inferno": [[0, 0, 4], [40, 12, 70], [101, 21, 110], [159, 42, 99], [212, 72, 66], [245, 125, 21], [250, 193, 39], [252, 255, 164]],
-            "Magma": [[0, 0, 4], [34, 12, 64], [88, 24, 124], [142, 41, 121], [192, 67, 87], [230, 107, 45], [249, 165, 22], [253, 227, 124], [251, 252, 191]],
-            "Cividis": [[0, 32, 76], [0, 42, 102], [0, 52, 110], [8, 64, 116], [20, 76, 120], [33, 88, 120], [46, 100, 120], [62, 112, 120], [82, 124, 118], [102, 136, 116], [124, 148, 112], [146, 162, 108], [171, 176, 104], [198, 192, 99], [226, 210, 97]]
-        }
-
-        # Get the selected color map or default if not found
-        color_map = color_maps.get(color_scheme, color_maps["Default"])
+        # Get coordinates from geometry and the value from properties, keeping
+        # only features with at least two coordinates
+        points = [(feature.get("geometry", {}).get("coordinates", [0, 0]),
+                   feature.get("properties", {}).get("value"))
+                  for feature in features]
+        points = [(coords, value) for coords, value in points if len(coords) >= 2]
+
+        # Each column is converted to a float array in one call instead of
+        # element by element; null values become 0
+        xy = np.asarray([coords[:2] for coords, _ in points], dtype=float).reshape(-1, 2)
+        values = pd.Series([value for _, value in points], dtype="float64").fillna(0.0)
+
+        # Create DataFrame from the columns
+        return len(features), pd.DataFrame({
+            "lon": xy[:, 0],
+            "lat": xy[:, 1],
+            "value": values.to_numpy(),
+        })
+
+    # The layer always reads the "weight" column: MinMax-scaled values when
+    # normalizing, the raw values otherwise. Cached per normalize setting
+    @st.cache_data(show_spinner=False)
+    def load_weighted_df(path, mtime, normalize):
+        n_features, df = load_heatmap_df(path, mtime)
+        v = df["value"].to_numpy()
+        df["weight"] = v
+        if normalize and len(v) > 0:
+            vmin, vmax = v.min(), v.max()
+            if vmax > vmin:  # Avoid division by zero
+                df["weight"] = (v - vmin) / (vmax - vmin)
+                return n_features, df, vmin, vmax
+        return n_features, df, None, None
+
+    # Above this many points the layer gets pre-binned data: a BINS x BINS
+    # weighted histogram, one point per non-empty cell, instead of every point
+    MAX_LAYER_POINTS = 20_000
+    BINS = 400
+
+    # The frame the layer draws, binned if large, with only the columns the
+    # layer and tooltip read at float32 precision. It depends only on the file
+    # and normalize, so slider changes reuse it instead of re-binning
+    @st.cache_data(show_spinner=False)
+    def load_layer_df(path, mtime, normalize):
+        _, df, _, _ = load_weighted_df(path, mtime, normalize)
+        if len(df) > MAX_LAYER_POINTS:
+            df = bin_heatmap_points(df, BINS)
+        return float32_payload(df[["lon", "lat", "value", "weight"]])
+
+    # Color ranges are sampled from the matplotlib colormap of the same name
+    # ("Default" is YlOrRd), once per scheme
+    @st.cache_data(show_spinner=False)
+    def heatmap_palette(name, n=9):
+        import matplotlib
+        cmap_name = "YlOrRd" if name == "Default" else name.lower()
+        cmap = matplotlib.colormaps.get(cmap_name, matplotlib.colormaps["YlOrRd"])
+        return (cmap(np.linspace(0, 1, n))[:, :3] * 255).round().astype(int).tolist()
+
+    # Decks (and their static HTML) are kept per parameter combination, so
+    # returning to earlier slider settings is a cache lookup; max_entries keeps
+    # long sessions from piling them up
+    @st.cache_resource(max_entries=32, show_spinner=False)
+    def make_heatmap_deck(path, mtime, radius_pixels, intensity, threshold, color_scheme, normalize):
+        layer_df = load_layer_df(path, mtime, normalize)
+        color_map = heatmap_palette(color_scheme)
 
         # Create heatmap layer with user-selected parameters
         layer = pdk.Layer(
             "HeatmapLayer",
-            data=df,
+            data=layer_df,
             get_position=["lon", "lat"],
-            get_weight=weight_column,
+            get_weight="weight",
             radiusPixels=radius_pixels,
             intensity=intensity,
             threshold=threshold,
@@ -360,14 +419,51 @@ elif mode == "GeoJSON Heatmaps":
             latitude=-30, longitude=135, zoom=4, pitch=0
         )
 
-        # Create and display the deck
-        r = pdk.Deck(
-            layers=[layer], 
+        return pdk.Deck(
+            layers=[layer],
             initial_view_state=view_state,
             tooltip={"text": "Value: {value}"}
         )
 
-        st.pydeck_chart(r, use_container_width=True)
+    @st.cache_resource(max_entries=32, show_spinner=False)
+    def make_heatmap_deck_html(*deck_params):
+        return make_heatmap_deck(*deck_params).to_html(as_string=True)
+
+    # The layer controls and the map form a fragment: moving a slider reruns
+    # only this function, not the file loading and statistics around it.
+    # Fragments can't write to the sidebar, so the controls sit above the map
+    @st.fragment
+    def render_heatmap(path, mtime, normalize, fast_render):
+        # Add controls for heatmap visualization
+        st.markdown("**Heatmap Settings**")
+        col_radius, col_intensity, col_threshold, col_scheme = st.columns(4)
+        radius_pixels = col_radius.slider("Radius (pixels)", 10, 100, 40)
+        intensity = col_intensity.slider("Intensity", 0.1, 5.0, 1.0, 0.1)
+        threshold = col_threshold.slider("Threshold", 0.01, 0.5, 0.01, 0.01)
+
+        # Color scheme selection
+        color_scheme = col_scheme.selectbox(
+            "Color Scheme",
+            ["Default", "Viridis", "Plasma", "Inferno", "Magma", "Cividis"]
+        )
+
+        # Create and display the deck
+        deck_params = (path, mtime, radius_pixels, intensity, threshold, color_scheme, normalize)
+        if fast_render:
+            components.html(make_heatmap_deck_html(*deck_params), height=650)
+        else:
+            st.pydeck_chart(make_heatmap_deck(*deck_params), use_container_width=True)
+
+    # Load the selected GeoJSON file
+    try:
+        mtime = os.path.getmtime(geojson_path)
+        n_features, df, min_val, max_val = load_weighted_df(geojson_path, mtime, normalize)
+        st.write(f"Loaded {n_features} data points from {geojson_path}")
+
+        if min_val is not None:
+            st.info(f"Values normalized from range [{min_val:.2f}, {max_val:.2f}] to [0, 1]")
+
+        render_heatmap(geojson_path, mtime, normalize, fast_render)
 
         # Show data statistics
         with st.expander("Data Statistics"):
@@ -397,12 +493,10 @@ elif mode == "GeoJSON Heatmaps":
                 if non_zero > 0:
                     st.write("**Value Distribution (non-zero values only)**")
                     # Filter out zeros for better visualization
-                    hist_data = df[df['value'] > 0]['value']
-                    fig = plt.figure(figsize=(10, 4))
-                    plt.hist(hist_data, bins=20)
-                    plt.xlabel('Value')
-                    plt.ylabel('Frequency')
-                    st.pyplot(fig)
+                    hist_data = df[df['value'] > 0]['value'].to_numpy()
+                    counts, edges = np.histogram(hist_data, bins=20)
+                    bin_centers = np.round((edges[:-1] + edges[1:]) / 2, 2)
+                    st.bar_chart(pd.DataFrame({"Frequency": counts}, index=pd.Index(bin_centers, name="Value")))
             else:
                 st.write("No data points available for statistics.")
 
@@ -413,115 +507,125 @@ elif mode == "GeoJSON Heatmaps":
 elif mode == "Power Stations":
     st.subheader("Major Power Stations in Australia")
 
+    fast_render = st.sidebar.checkbox("Fast render (static)", value=False)
+
+    # Properties the layer and tooltip use; everything else is dropped while reading
+    POWER_STATION_FIELDS = ("name", "generationtype", "generationmw", "primaryfueltype",
+                            "operationalstatus", "owner", "locality", "state")
+
     # --- Load file
-    import math
-    with open("map_data/Major_Power_Stations.geo.json", "r", encoding="utf-8") as f:
-        fc = json.load(f)
-
-    feats = fc.get("features", [])
-    st.write(f"Loaded features: {len(feats)}")
-
-    # --- Extract points + quick QA
-    pts = []
-    out_of_range = 0
-    for ft in feats:
-        if not ft or ft.get("geometry", {}).get("type") != "Point":
-            continue
-        coords = ft["geometry"].get("coordinates")
-        if not isinstance(coords, (list, tuple)) or len(coords) < 2:
-            continue
-        lon, lat = coords[0], coords[1]
-        pts.append((lon, lat, ft))
-
-        # Count obviously out-of-Australia points
-        if not (110 <= (lon or 0) <= 155 and -45 <= (lat or 0) <= -10):
-            out_of_range += 1
-
-    st.write(f"Point features: {len(pts)} | Out-of-range (pre-fix): {out_of_range}")
+    # Features are streamed with ijson, so the full parsed document is never
+    # held in memory. The points are gathered straight into one list per
+    # column (coordinates and the used properties), no per-feature objects
+    @st.cache_data(show_spinner=False)
+    def load_power_stations(path, mtime):
+        import ijson
+
+        n_features = 0
+        columns = {k: [] for k in ("lon", "lat") + POWER_STATION_FIELDS}
+        with open(path, "rb") as f:
+            for ft in ijson.items(f, "features.item", use_float=True):
+                n_features += 1
+                if not ft or (ft.get("geometry") or {}).get("type") != "Point":
+                    continue
+                coords = ft["geometry"].get("coordinates")
+                if not isinstance(coords, (list, tuple)) or len(coords) < 2:
+                    continue
+                props = ft.get("properties") or {}
+                columns["lon"].append(coords[0])
+                columns["lat"].append(coords[1])
+                for k in POWER_STATION_FIELDS:
+                    columns[k].append(props.get(k))
+        return n_features, columns
+
+    power_path = "map_data/Major_Power_Stations.geo.json"
+    n_features, columns = load_power_stations(power_path, os.path.getmtime(power_path))
+    n_points = len(columns["lon"])
+    st.write(f"Loaded features: {n_features}")
+
+    # --- Quick QA, on coordinate arrays (non-numeric coordinates become NaN)
+    lons = pd.to_numeric(pd.Series(columns["lon"], dtype=object), errors="coerce").to_numpy(dtype=float)
+    lats = pd.to_numeric(pd.Series(columns["lat"], dtype=object), errors="coerce").to_numpy(dtype=float)
+
+    # Rough Australian bounding box, as one boolean mask over the arrays
+    def in_australia(lons, lats):
+        return (lons >= 110) & (lons <= 155) & (lats >= -45) & (lats <= -10)
+
+    # Count obviously out-of-Australia points
+    in_range = np.count_nonzero(in_australia(lons, lats))
+    out_of_range = n_points - in_range
+
+    st.write(f"Point features: {n_points} | Out-of-range (pre-fix): {out_of_range}")
 
     # --- Detect lat/lon swap and fix if needed (heuristic)
     # If most points are out-of-range but the swapped version falls in range, assume swap.
-    if len(pts) > 0:
-        in_range = sum(1 for lon, lat, _ in pts if 110 <= lon <= 155 and -45 <= lat <= -10)
-        swapped_in_range = sum(1 for lon, lat, _ in pts if 110 <= lat <= 155 and -45 <= lon <= -10)
-        swapped = swapped_in_range > in_range * 3 and swapped_in_range >= max(5, 0.5 * len(pts))
-    else:
-        swapped = False
+    swapped_in_range = np.count_nonzero(in_australia(lats, lons))
+    swapped = n_points > 0 and swapped_in_range > in_range * 3 and swapped_in_range >= max(5, 0.5 * n_points)
 
     if swapped:
         st.warning("Detected probable lat/lon swap in data — auto-correcting.")
-        for i, (lon, lat, ft) in enumerate(pts):
-            pts[i] = (lat, lon, ft)  # swap
-            ft["geometry"]["coordinates"] = [lat, lon]
+        lons, lats = lats, lons
 
     # --- Precompute radius safely + classify renewable vs non-renewable
     # Define renewable fuel types
     RENEWABLE_FUELS = {"solar", "wind", "hydro", "geothermal", "biomass", "biogas", "tidal", "wave"}
 
-    total_valid = 0
-    rows = []
-    for lon, lat, ft in pts:
-        props = ft.setdefault("properties", {})
-        try:
-            cap = float(props.get("generationmw", 0) or 0)
-        except Exception:
-            cap = 0.0
-        # meters; clamp 2–25 km so tiny plants still visible
-        props["__radius__"] = max(2000, min(cap * 50, 25000))
-
-        # Classify as renewable or non-renewable
-        fuel_type = str(props.get("primaryfueltype", "")).lower()
-        props["class"] = "Renewable" if fuel_type in RENEWABLE_FUELS else "Non-Renewable"
-
-        # Create a row for the normalized GeoJSON
-        row = {"lon": lon, "lat": lat}
-        row.update(props)
-        rows.append(row)
-
-        total_valid += 1
+    # One column per used property; missing values are None so they
+    # serialize as JSON null. Points without finite coordinates can't be drawn
+    fields = list(POWER_STATION_FIELDS)
+    df = pd.DataFrame({
+        "lon": lons,
+        "lat": lats,
+        **{k: pd.Series(columns[k], dtype=object) for k in fields},
+    })
+    df[fields] = df[fields].where(df[fields].notna(), None)
+    df = df[np.isfinite(lons) & np.isfinite(lats)].reset_index(drop=True)
+
+    # Radius and class as whole-column expressions
+    cap = pd.to_numeric(df["generationmw"], errors="coerce").fillna(0).to_numpy()
+    # meters; clamp 2–25 km so tiny plants still visible. Whole metres are
+    # plenty for a 2 km+ circle and serialize shorter
+    df["radius"] = np.clip(cap * 50, 2000, 25000).round().astype(int)
+
+    # Classify as renewable or non-renewable; the fill colour is precomputed
+    # per row so deck.gl reads it straight from the data
+    # Fuel types repeat a handful of values, so each distinct value is
+    # classified once and mapped back through its integer code (missing
+    # values get code -1, which hits the trailing False)
+    fuel_codes, fuel_types = pd.factorize(df["primaryfueltype"])
+    renewable_fuel = np.array([str(f).lower() in RENEWABLE_FUELS for f in fuel_types] + [False], dtype=bool)
+    is_renewable = renewable_fuel[fuel_codes]
+    df["class"] = np.where(is_renewable, "Renewable", "Non-Renewable")
+    df["fill_color"] = np.where(is_renewable[:, None], [0, 180, 0, 180], [255, 0, 0, 180]).tolist()
+
+    total_valid = len(df)
     st.write(f"Valid point features after fixes: {total_valid}")
 
-    # Create normalized GeoJSON structure
-    features = [
-        {
-            "type": "Feature",
-            "geometry": {"type": "Point", "coordinates": [r["lon"], r["lat"]]},
-            "properties": {k: v for k, v in r.items() if k not in ("lon", "lat")}
-        }
-        for r in rows
-    ]
-    fc_norm = {"type": "FeatureCollection", "features": features}
-
     # --- Center the view on your data (fallback to AU if empty)
     if total_valid > 0:
-        lons = [lon for lon, _, _ in pts if isinstance(lon, (int, float)) and math.isfinite(lon)]
-        lats = [lat for _, lat, _ in pts if isinstance(lat, (int, float)) and math.isfinite(lat)]
-        if lons and lats:
-            ctr_lon = sum(lons)/len(lons)
-            ctr_lat = sum(lats)/len(lats)
-        else:
-            ctr_lon, ctr_lat = 135, -30
+        ctr_lon = df["lon"].to_numpy().mean()
+        ctr_lat = df["lat"].to_numpy().mean()
     else:
         ctr_lon, ctr_lat = 135, -30
 
     view_state = pdk.ViewState(latitude=ctr_lat, longitude=ctr_lon, zoom=4)
 
-    # --- Build a layer with color based on renewable/non-renewable class
+    # --- Build a layer with color based on renewable/non-renewable class;
+    # a ScatterplotLayer fed from the columns, no per-feature GeoJSON objects
+    # Coordinates go to the browser at float32 precision, like the heatmaps
+    layer_df = df[["lon", "lat", "radius", "fill_color", "class", *POWER_STATION_FIELDS]].copy()
+    layer_df[["lon", "lat"]] = float32_payload(layer_df[["lon", "lat"]])
     layer_power = pdk.Layer(
-        "GeoJsonLayer",
-        data=fc_norm,
+        "ScatterplotLayer",
+        data=layer_df,
         pickable=True,
         auto_highlight=True,
-        pointType="circle",
         filled=True,
         stroked=False,
-        get_point_radius="properties.__radius__",
-        get_fill_color="""
-        properties.class === 'Renewable'
-        ? [0, 180, 0, 180]
-        : [255, 0, 0, 180]
-    """,
-        point_radius_min_pixels=2,                    # ensure dot visible when zoomed out
+        get_position=["lon", "lat"],
+        get_radius="radius",
+        get_fill_color="fill_color",
+        radius_min_pixels=2,                          # ensure dot visible when zoomed out
     )
 
     # A small sanity marker so you always see *something* render
@@ -541,23 +645,23 @@ elif mode == "Power Stations":
         map_provider=None,
         tooltip={
             "html": (
-                "<b>Name:</b> {properties.name}<br>"
-                "<b>Type:</b> {properties.generationtype}<br>"
-                "<b>Capacity:</b> {properties.generationmw} MW<br>"
-                "<b>Fuel:</b> {properties.primaryfueltype}<br>"
-                "<b>Class:</b> {properties.class}<br>"
-                "<b>Status:</b> {properties.operationalstatus}<br>"
-                "<b>Owner:</b> {properties.owner}<br>"
-                "<b>Location:</b> {properties.locality}, {properties.state}"
+                "<b>Name:</b> {name}<br>"
+                "<b>Type:</b> {generationtype}<br>"
+                "<b>Capacity:</b> {generationmw} MW<br>"
+                "<b>Fuel:</b> {primaryfueltype}<br>"
+                "<b>Class:</b> {class}<br>"
+                "<b>Status:</b> {operationalstatus}<br>"
+                "<b>Owner:</b> {owner}<br>"
+                "<b>Location:</b> {locality}, {state}"
             )
         },
         height=650,
         parameters={"cull": False},
     )
 
-    st.pydeck_chart(deck, use_container_width=True)
+    show_deck(deck, static=fast_render)
 
     # --- Quick “table” peek to confirm properties exist
     with st.expander("Sample feature properties"):
-        sample = [ft["properties"] for _, _, ft in pts[:5]]
+        sample = df.drop(columns=["lon", "lat", "fill_color"]).head(5).to_dict("records")
         st.write(sample if sample else "No point features found.")
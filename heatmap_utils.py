@@ -0,0 +1,19 @@
+import numpy as np
+import pandas as pd
+
+
+# Pre-binning for large heatmap layers: a bins x bins weighted histogram, one
+# point per non-empty cell at the cell centre, carrying the summed "value"
+# and "weight" of the points that fell in it
+def bin_heatmap_points(df, bins):
+    lon, lat = df["lon"].to_numpy(), df["lat"].to_numpy()
+    weight, xe, ye = np.histogram2d(lon, lat, bins=bins, weights=df["weight"].to_numpy())
+    value, _, _ = np.histogram2d(lon, lat, bins=[xe, ye], weights=df["value"].to_numpy())
+    count, _, _ = np.histogram2d(lon, lat, bins=[xe, ye])
+    xi, yi = np.nonzero(count)
+    return pd.DataFrame({
+        "lon": (0.5 * (xe[:-1] + xe[1:]))[xi],
+        "lat": (0.5 * (ye[:-1] + ye[1:]))[yi],
+        "value": value[xi, yi],
+        "weight": weight[xi, yi],
+    })
@@ -0,0 +1,7 @@
+import sys
+from pathlib import Path
+
+# The extraction scripts and the frontend helpers are plain modules, not an
+# installed package, so make them importable from the tests
+ROOT = Path(__file__).resolve().parents[1]
+sys.path[:0] = [str(ROOT), str(ROOT / "data_extraction_code")]
@@ -0,0 +1,26 @@
+import numpy as np
+import pandas as pd
+import pytest
+from extract_bushfire_risk_optimized import _score, prioritize_risk_areas
+
+def build_risk_table():
+    # Several rows share a score, so the max_features cut falls on ties
+    return pd.DataFrame({
+        "risk_level": ["Extreme", "Moderate", "Extreme", "Low", "Moderate", "Extreme", "Minimal", "Moderate"],
+        "risk_code": [4, 2, 4, 1, 2, 4, 0, 2],
+        "fire_name": [f"fire {i}" for i in range(8)],
+        "status": ["Active", "Unknown", "Active", "Active", "Unknown", "Active", "Unknown", "Unknown"],
+        "area_hectares": [50.0, 10.0, 50.0, np.nan, 10.0, 50.0, 1.0, 10.0],
+        "original_geometry_type": ["Polygon"] * 8,
+        "geometry": [None] * 8,
+    })
+
+@pytest.mark.parametrize("max_features", [1, 2, 3, 4, 5, 7, 8])
+def test_prioritize_matches_stable_full_sort(max_features):
+    risk_areas = build_risk_table()
+    scores = _score(risk_areas["risk_code"].to_numpy(dtype=np.int8),
+                    risk_areas["area_hectares"].fillna(0).to_numpy(),
+                    (risk_areas["status"] == "Active").to_numpy(dtype=np.uint8))
+    expected = risk_areas["fire_name"].to_numpy()[np.argsort(-scores, kind="stable")[:max_features]]
+    kept = prioritize_risk_areas(risk_areas, max_features)
+    assert kept["fire_name"].tolist() == expected.tolist()
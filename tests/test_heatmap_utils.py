@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+import pytest
+from heatmap_utils import bin_heatmap_points
+
+def test_binning_keeps_total_weight_and_value():
+    rng = np.random.default_rng(0)
+    n = 5000
+    df = pd.DataFrame({
+        "lon": rng.uniform(110, 155, n),
+        "lat": rng.uniform(-45, -10, n),
+        "value": rng.uniform(0, 10, n),
+    })
+    df["weight"] = df["value"] / 10
+    binned = bin_heatmap_points(df, 20)
+    assert len(binned) <= 20 * 20
+    assert binned["weight"].sum() == pytest.approx(df["weight"].sum())
+    assert binned["value"].sum() == pytest.approx(df["value"].sum())
+    assert binned["lon"].between(df["lon"].min(), df["lon"].max()).all()
+    assert binned["lat"].between(df["lat"].min(), df["lat"].max()).all()
+
+def test_binning_emits_one_point_per_occupied_cell():
+    df = pd.DataFrame({
+        "lon": [110.0, 110.1, 110.2, 150.0, 149.9],
+        "lat": [-40.0, -40.1, -39.9, -12.0, -12.1],
+        "value": [1.0, 2.0, 3.0, 4.0, 5.0],
+        "weight": [0.1, 0.2, 0.3, 0.4, 0.5],
+    })
+    binned = bin_heatmap_points(df, 10).sort_values("lon", ignore_index=True)
+    assert len(binned) == 2
+    assert binned["value"].tolist() == pytest.approx([6.0, 9.0])
+    assert binned["weight"].tolist() == pytest.approx([0.6, 0.9])
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+import shapely
+from shapely.geometry import box
+from optimize_bushfire_data import cluster_overlapping, dissolve_geometries, top_rows
+
+def geometry_array(geoms):
+    return np.array(geoms, dtype=object)
+
+def test_chained_overlaps_form_one_cluster():
+    # A overlaps B and B overlaps C, but A and C are disjoint
+    a, b, c = box(0, 0, 2, 1), box(1, 0, 3, 1), box(2.5, 0, 4, 1)
+    assert not a.intersects(c)
+    labels = cluster_overlapping(geometry_array([a, b, c]))
+    assert labels[0] == labels[1] == labels[2]
+
+def test_long_shuffled_chain_is_one_cluster():
+    # Each box only overlaps its neighbours; shuffled so labels need several rounds to settle
+    chain = [box(i, 0, i + 1.5, 1) for i in range(50)]
+    order = np.random.default_rng(0).permutation(len(chain))
+    geoms = geometry_array([chain[i] for i in order] + [box(100, 100, 101, 101)])
+    labels = cluster_overlapping(geoms)
+    assert len(set(labels[:50].tolist())) == 1
+    assert labels[50] != labels[0]
+
+def test_touching_polygons_cluster_disjoint_ones_do_not():
+    left, touching, apart = box(0, 0, 1, 1), box(1, 0, 2, 1), box(5, 0, 6, 1)
+    labels = cluster_overlapping(geometry_array([left, touching, apart]))
+    assert labels[0] == labels[1]
+    assert labels[2] != labels[0]
+
+def test_dissolve_matches_unary_union():
+    geoms = [box(0, 0, 1, 1), box(1, 0, 2, 1), box(0.5, 0.5, 1.5, 2), box(5, 0, 6, 1)]
+    dissolved = dissolve_geometries(geoms)
+    assert dissolved.geom_type == "MultiPolygon"
+    assert len(dissolved.geoms) == 2
+    assert dissolved.area == pytest.approx(shapely.unary_union(geoms).area)
+    assert dissolved.equals(shapely.unary_union(geoms))
+
+def test_dissolve_single_cluster_is_polygon():
+    dissolved = dissolve_geometries([box(0, 0, 2, 1), box(1, 0, 3, 1)])
+    assert dissolved.geom_type == "Polygon"
+    assert dissolved.area == pytest.approx(3.0)
+
+@pytest.mark.parametrize("k", [0, 1, 2, 3, 4, 5, 8, 10])
+def test_top_rows_matches_stable_sort_with_ties(k):
+    key = np.array([5.0, 3.0, 5.0, 1.0, 3.0, 3.0, 5.0, 2.0])
+    expected = np.sort(np.argsort(-key, kind="stable")[:k])
+    np.testing.assert_array_equal(top_rows(key, k), expected)